@@ -1,17 +1,353 @@
 #!/usr/bin/env python3
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+import tkinter.font as tkfont
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import base64
+import collections
 import csv
 import json
+import math
+import operator
 import os
+import random
 import re
 import datetime
+import hashlib
+import io
+import sqlite3
+import time
+import queue
+import threading
+import traceback
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from enum import IntEnum
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
 import google.generativeai as genai
 
+# orjson is an optional speedup for JSON parsing and history persistence; fall back to stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Parse JSON from bytes or str (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Strips everything but word characters from vehicle fields used in history filenames
+_SAFE_CHARS_RE = re.compile(r'[^\w]+')
+
+# Top-level keys of a per-scan file that make up its index entry
+_INDEX_FIELDS = ('timestamp', 'vin', 'vehicle_string', 'status', 'bid_analysis')
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WS_RE = re.compile(r'[ \t\n\r]*')
+
+# NHTSA decode variables -> vehicle_info keys
+_VIN_CORE_FIELDS = {
+    'Make': 'make',
+    'Model': 'model',
+    'Model Year': 'year',
+    'Trim': 'trim',
+}
+_VIN_FIELD_MAP = {
+    # Engine specifications
+    'Engine Number of Cylinders': 'engine_cylinders',
+    'Fuel Type - Primary': 'fuel_type',
+    'Engine Configuration': 'engine_configuration',
+    # Drive and transmission
+    'Drive Type': 'drive_type',
+    'Transmission Style': 'transmission_style',
+    'Transmission Speeds': 'transmission_speeds',
+    # Body specifications
+    'Body Class': 'body_class',
+    'Doors': 'doors',
+    'Vehicle Type': 'vehicle_type',
+}
+# Displacement variables in order of preference, with the divisor to get liters
+_VIN_DISPLACEMENT_FIELDS = {
+    'Displacement (L)': 1,
+    'Displacement (CC)': 1000,
+}
+
+# Title keywords that mark a listing as a small component rather than the part itself
+_SUSPICIOUS_KEYWORDS = {
+    'engine': ['oil filter', 'housing', 'gasket', 'seal', 'sensor', 'valve cover', 'dipstick', 'bracket', 'mount', 'belt', 'pulley'],
+    'alternator': ['brush', 'pulley', 'wire', 'connector', 'regulator', 'belt'],
+    'transmission': ['fluid', 'filter', 'gasket', 'cooler', 'mount', 'line'],
+    'starter': ['solenoid', 'brush', 'drive', 'gear', 'bolt'],
+    'brake caliper': ['pad', 'rotor', 'disc', 'fluid', 'line', 'hose'],
+    'fuel pump': ['filter', 'line', 'hose', 'tank', 'sending unit'],
+    'headlight': ['bulb', 'ballast', 'wire', 'connector', 'lens', 'cover']
+}
+_SUSPICIOUS_KEYWORD_RES = {
+    part: re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+    for part, keywords in _SUSPICIOUS_KEYWORDS.items()
+}
+
+# Prompt fitment guidance: per vehicle_info field, (substrings, guidance) rules - first match wins
+_FITMENT_RULES = (
+    ('drive_type', (
+        (('awd', 'all-wheel'), "AWD systems have unique drivetrain components - exclude FWD/RWD specific parts"),
+        (('fwd', 'front-wheel'), "FWD vehicle - exclude RWD/AWD specific drivetrain parts"),
+        (('rwd', 'rear-wheel'), "RWD vehicle - exclude FWD/AWD specific drivetrain parts"),
+    )),
+    ('fuel_type', (
+        (('diesel',), "Diesel engine - fuel system parts differ significantly from gasoline"),
+        (('gasoline',), "Gasoline engine - exclude diesel-specific fuel system parts"),
+    )),
+    ('body_class', (
+        (('coupe',), "Coupe body - some parts may differ from sedan variants"),
+        (('sedan',), "Sedan body - some parts may differ from coupe/hatchback variants"),
+        (('suv', 'truck'), "SUV/Truck body - larger/heavier duty components than car variants"),
+    )),
+)
+
+# Runs of spaces/tabs and of 3+ newlines in the custom instructions (squeezed before prompting)
+_PROMPT_SPACES_RE = re.compile(r'[ \t]+')
+_PROMPT_BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n+')
+
+# Fixed parts of the analysis prompt - only the header, CSV and min-price line vary per part
+_PROMPT_FILTER_RULES = """**FILTER OUT:**
+1. Accessories/small parts (filters, gaskets, bulbs, connectors, etc.)
+2. New/aftermarket/premium items
+3. Wrong specifications for this vehicle
+4. Obvious outliers (damaged cores or overpriced items)"""
+
+_PROMPT_CONFIDENCE_RULES = """
+**CONFIDENCE RULES:**
+- RED if majority of data is wrong engine size/transmission/drivetrain type
+- RED if mostly inappropriate listings  
+- ORANGE if poor data quality or small sample
+- YELLOW if mixed quality
+- LIGHT_GREEN if good appropriate data
+- DARK_GREEN if excellent high-quality data
+"""
+
+_PROMPT_STATIC_TAIL = _PROMPT_CONFIDENCE_RULES + """
+**OUTPUT:** JSON in the response schema. Price tiers are the 10-20th (low), 25-40th (average)
+and 45-60th (high) percentiles of the kept listings, rounded."""
+
+# Tail of the all-parts prompt - one entry per part, in the same shape as the single-part reply
+_PROMPT_BATCH_TAIL = _PROMPT_CONFIDENCE_RULES + """
+**OUTPUT:** JSON in the response schema, one "results" entry per part with part_name set to the
+exact name in its PART header. Price tiers are the 10-20th (low), 25-40th (average) and 45-60th
+(high) percentiles of that part's kept listings, rounded."""
+
+
+
+class Conf(IntEnum):
+    """AI confidence ratings, best to worst (stored and sent to Gemini as the lowercase name)"""
+    DARK_GREEN = 0
+    LIGHT_GREEN = 1
+    YELLOW = 2
+    ORANGE = 3
+    RED = 4
+
+
+# Display labels indexed by Conf value
+CONF_LABEL = ('🟢 High', '🟢 Good', '🟡 Medium', '🟠 Low', '🔴 Poor')
+
+# Rating names as they appear in AI replies and saved results
+_CONF_NAMES = tuple(conf.name.lower() for conf in Conf)
+
+# Response schemas handed to Gemini (response_mime_type="application/json"), so replies parse as-is
+_AI_PART_PROPERTIES = {
+    'low_price': {'type': 'number', 'description': '10-20th percentile, rounded'},
+    'average_price': {'type': 'number', 'description': '25-40th percentile, rounded'},
+    'high_price': {'type': 'number', 'description': '45-60th percentile, rounded'},
+    'items_analyzed': {'type': 'integer', 'description': 'total count'},
+    'items_filtered_out': {'type': 'integer', 'description': 'removed count'},
+    'reasoning': {'type': 'string', 'description': 'brief filter logic'},
+    'confidence_rating': {'type': 'string', 'format': 'enum',
+                          'enum': list(_CONF_NAMES)},
+    'confidence_explanation': {'type': 'string', 'description': 'brief confidence reason'},
+}
+_AI_RESPONSE_SCHEMA = {
+    'type': 'object',
+    'properties': _AI_PART_PROPERTIES,
+    'required': list(_AI_PART_PROPERTIES),
+}
+_AI_BATCH_RESPONSE_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'results': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {'part_name': {'type': 'string'}, **_AI_PART_PROPERTIES},
+                'required': ['part_name', *_AI_PART_PROPERTIES],
+            },
+        },
+    },
+    'required': ['results'],
+}
+
+# Keys every per-part AI result must carry, and the confidence ratings it may use
+_AI_RESULT_KEYS = ('low_price', 'average_price', 'high_price', 'items_analyzed', 'items_filtered_out',
+                   'reasoning', 'confidence_rating', 'confidence_explanation')
+_AI_CONFIDENCE_LEVELS = frozenset(_CONF_NAMES)
+
+# Line breaks in listing titles become spaces so each listing stays on one CSV row
+_TITLE_FLATTEN = str.maketrans({'\r': ' ', '\n': ' '})
+
+# Search model names for trims eBay sellers don't list separately (Chrysler 300C/300S -> 300)
+_MODEL_REWRITES = {
+    ('CHRYSLER', '300C'): '300',
+    ('CHRYSLER', '300S'): '300',
+}
+
+# Match the manual search - Used condition (3000), Buy It Now only
+_STATIC_SEARCH_FILTERS = ("conditionIds:{3000}", "buyingOptions:{FIXED_PRICE}")
+
+# Characters not allowed in preset filenames
+_PRESET_NAME_SAFE_RE = re.compile(r'[^\w\-_.]')
+
+# Valid 17-character VIN (letters I, O and Q are never used)
+_VIN_RE = re.compile(r'^[A-HJ-NPR-Z0-9]{17}$')
+
+# Confidence ratings that flag a part as low confidence (ORANGE and worse)
+LOW_CONF_SET = frozenset(conf.name.lower() for conf in Conf if conf >= Conf.ORANGE)
+
+# Display labels for the AI confidence rating names
+_CONFIDENCE_DISPLAY = {conf.name.lower(): CONF_LABEL[conf] for conf in Conf}
+
+# Part row of the pricing breakdown: name, budget, standard, premium, confidence
+_ROW_FMT = "{:<20} ${:<9.2f} ${:<9.2f} ${:<9.2f} {:<15}\n".format
+
+
+class _JitterRetry(Retry):
+    """urllib3 Retry that adds random jitter to the exponential backoff"""
+    
+    def get_backoff_time(self):
+        # Spread out retries from parallel part searches so they don't hit eBay in lockstep
+        backoff = super().get_backoff_time()
+        return backoff + random.uniform(0, backoff) if backoff else 0
+
+
+@dataclass(slots=True)
+class VinHistoryEntry:
+    """A completed VIN scan in the history list
+    
+    Entries loaded from index.json are lightweight: only the display fields are set
+    until load_full_analysis fills in the rest from the per-scan file.
+    """
+    # Index fields come first so they lead the saved file (see _read_index_fields)
+    timestamp: datetime.datetime
+    vin: str
+    vehicle_string: str
+    status: str
+    bid_analysis: dict
+    vehicle_info: Optional[dict] = None
+    parts_prices: Optional[dict] = None
+    failed_parts: List[str] = field(default_factory=list)
+    low_confidence_parts: List[str] = field(default_factory=list)
+    filename: Optional[str] = None
+    
+    @property
+    def is_lightweight(self) -> bool:
+        return self.parts_prices is None
+    
+    @property
+    def bids(self) -> Dict:
+        return self.bid_analysis.get('bids', {})
+    
+    @property
+    def totals(self) -> Dict:
+        return self.bid_analysis.get('totals', {})
+    
+    def to_dict(self) -> Dict:
+        """Shallow dict in the per-scan JSON file layout"""
+        return {name: getattr(self, name) for name in _ENTRY_FIELD_NAMES}
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'VinHistoryEntry':
+        """Build an entry from a saved per-scan JSON file"""
+        timestamp = data['timestamp']
+        if isinstance(timestamp, str):
+            timestamp = datetime.datetime.fromisoformat(timestamp)
+        return cls(
+            timestamp=timestamp,
+            vin=data.get('vin', ''),
+            vehicle_string=data.get('vehicle_string', ''),
+            status=data.get('status', ''),
+            bid_analysis=data.get('bid_analysis', {}),
+            vehicle_info=data.get('vehicle_info'),
+            parts_prices=data.get('parts_prices'),
+            failed_parts=data.get('failed_parts', []),
+            low_confidence_parts=data.get('low_confidence_parts', []),
+            filename=data.get('filename')
+        )
+
+def _percentile(sorted_data, percentile):
+    """Percentile of already-sorted data using linear interpolation"""
+    if len(sorted_data) == 1:
+        return sorted_data[0]
+    index = (percentile / 100.0) * (len(sorted_data) - 1)
+    lower_index = int(index)
+    upper_index = min(lower_index + 1, len(sorted_data) - 1)
+    weight = index - lower_index
+    return sorted_data[lower_index] * (1 - weight) + sorted_data[upper_index] * weight
+
+
+def _smart_round(price):
+    """Round a price tier based on price range"""
+    if price < 100:
+        return round(price / 5) * 5  # Round to nearest $5
+    elif price < 500:
+        return round(price / 10) * 10  # Round to nearest $10
+    else:
+        return round(price / 25) * 25  # Round to nearest $25
+
+
+def _small_round(price):
+    """Round a price tier with smaller increments (for small datasets)"""
+    if price < 50:
+        return round(price)  # Round to nearest $1
+    elif price < 200:
+        return round(price / 5) * 5  # Round to nearest $5
+    else:
+        return round(price / 10) * 10  # Round to nearest $10
+
+
+def _bid_for_parts_value(parts_value):
+    """Recommended bid for a total parts value
+    
+    if Parts_Value <= 3000: Bid = 300
+    else: Excess = Parts_Value - 3000; Percentage = 0.25 + 0.40 × sqrt(Excess / 15000); Bid = 300 + Excess × Percentage
+    """
+    if parts_value <= 0:
+        return 0
+    elif parts_value <= 3000:
+        return 300
+    excess = parts_value - 3000
+    return 300 + excess * (0.25 + 0.40 * math.sqrt(excess / 15000))
+
+
+def _sample_items_for_ai(raw_items, max_items=80, middle_rows=60, tail_rows=5):
+    """Representative subset of a large result set for the AI prompt
+    
+    Sorted by total; keeps tail_rows from each end (so outliers are still visible to filter)
+    and middle_rows spread evenly over the 10th-70th percentile band the tiers come from.
+    """
+    if len(raw_items) <= max_items:
+        return raw_items
+    ordered = sorted(raw_items, key=lambda item: item.get('total_price', item.get('price', 0) + item.get('shipping', 0)))
+    n = len(ordered)
+    middle = ordered[int(n * 0.1):int(n * 0.7)]
+    if len(middle) > middle_rows:
+        middle = [middle[i * len(middle) // middle_rows] for i in range(middle_rows)]
+    return ordered[:tail_rows] + middle + ordered[-tail_rows:]
+
+
+# Field names in declaration order (the per-scan file layout)
+_ENTRY_FIELD_NAMES = tuple(f.name for f in fields(VinHistoryEntry))
+
 # Load environment variables
 load_dotenv()
 
@@ -27,25 +363,56 @@ class PhoenixAuctionAssistant:
         self.ebay_client_id = os.getenv('EBAY_CLIENT_ID')
         self.ebay_client_secret = os.getenv('EBAY_CLIENT_SECRET')
         self.ebay_environment = os.getenv('EBAY_ENVIRONMENT', 'SANDBOX')
+        self._set_ebay_basic_auth()
         self.ebay_access_token = None
         self.ebay_token_expiry = None  # Track token expiration
-        
-        # Load Gemini API credentials and configure
-        self.gemini_api_key = os.getenv('GEMINI_API_KEY')
-        self.use_ai_analysis = os.getenv('USE_AI_ANALYSIS', 'true').lower() == 'true'
-        
-        if self.gemini_api_key and self.use_ai_analysis:
-            try:
-                genai.configure(api_key=self.gemini_api_key)
-                self.gemini_model = genai.GenerativeModel('gemini-2.0-flash-exp')
-            except Exception as e:
-                print(f"Failed to initialize Gemini model: {e}")
-                self.gemini_model = None
-        else:
-            self.gemini_model = None
+        # Token persisted outside the project folder (it's a credential) so restarts reuse it
+        self.ebay_token_file = os.path.join(os.path.expanduser('~'), '.phx_pricing', 'ebay_token.json')
+        self._load_cached_ebay_token()
+        self._token_lock = threading.Lock()  # Serialize refreshes from concurrent searches
+        
+        # Load Gemini API credentials and build the one model every analysis shares
+        self.gemini_api_key = None
+        self.use_ai_analysis = None
+        self.gemini_model = None
+        self.reload_gemini(reload_env=False)
+        # Below this many listings a Gemini call isn't worth the round trip
+        self.ai_min_items = int(os.getenv('AI_MIN_ITEMS', '5'))
+        
+        # Part analyses run on the search threads - cap how many Gemini calls are in flight
+        # to stay under the per-minute quota (the eBay searches themselves can run wider)
+        self._ai_semaphore = threading.BoundedSemaphore(max(1, int(os.getenv('AI_CONCURRENCY', '5'))))
+        
+        # Parsed AI results keyed by a hash of the prompt, so identical re-runs skip Gemini
+        self._ai_cache = collections.OrderedDict()  # key -> (stored_at, result)
+        self._ai_cache_lock = threading.Lock()
+        
+        # Vehicle context + custom instruction sections of the prompt, built once per
+        # (vehicle, instructions) so every part of a scan reuses the same text
+        self._prompt_context_cache = {}
+        
+        # Background worker for the scan pipeline - only the UI thread touches Tk widgets,
+        # the worker posts (kind, payload) tuples to ui_queue which _drain_queue applies
+        self.executor = ThreadPoolExecutor(max_workers=8)
+        # History file writes get their own pool so they can drain at exit while scans are cancelled
+        self.io_executor = ThreadPoolExecutor(max_workers=2)
+        # Set by on_close; a running scan checks it between parts and stops early
+        self._closing = threading.Event()
+        self.ui_queue = queue.Queue()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Shared HTTP session so eBay / NHTSA calls reuse keep-alive connections
+        self.http = self._create_http_session()
         
         self.setup_gui()
         self.load_parts_list()
+        self._init_search_cache()
+        
+        # Coalesce index rewrites from removals/clears into one write every 500ms
+        self.root.after(500, self._flush_index_if_dirty)
+        
+        # Renew the eBay token in the background before it runs out
+        self.root.after(60000, self._schedule_token_refresh)
     
     def setup_gui(self):
         # Configure root window for proper resizing
@@ -64,9 +431,14 @@ class PhoenixAuctionAssistant:
         self.vin_entry.grid(row=0, column=1, padx=5, pady=5)
         
         self.calculate_btn = ttk.Button(control_frame, text="Calculate Bid", 
-                                       command=self.calculate_bid)
+                                       command=self._submit_calculate)
         self.calculate_btn.grid(row=0, column=2, padx=5, pady=5)
         
+        # Force fresh eBay searches and AI analyses (cached results are otherwise reused for a day)
+        self.clear_cache_btn = ttk.Button(control_frame, text="Clear Cache",
+                                         command=self.clear_cached_results)
+        self.clear_cache_btn.grid(row=0, column=3, padx=5, pady=5)
+        
         # Create notebook for tabs
         self.notebook = ttk.Notebook(main_frame)
         self.notebook.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -87,6 +459,13 @@ class PhoenixAuctionAssistant:
         final_scrollbar.grid(row=0, column=1, sticky="ns")
         self.final_output_text.configure(yscrollcommand=final_scrollbar.set)
         
+        # Report styling - display_results writes tagged segments in a single insert
+        self._report_bold_font = tkfont.Font(font=self.final_output_text.cget('font'))
+        self._report_bold_font.configure(weight='bold')
+        self.final_output_text.tag_configure('hdr', font=self._report_bold_font)
+        self.final_output_text.tag_configure('bold', font=self._report_bold_font)
+        self.final_output_text.tag_configure('warn', foreground='#c05000')
+        
         self.final_output_frame.grid_rowconfigure(0, weight=1)
         self.final_output_frame.grid_columnconfigure(0, weight=1)
         
@@ -137,18 +516,170 @@ class PhoenixAuctionAssistant:
         # Initialize storage for raw search results
         self.raw_search_results = {}
         
-        # Initialize VIN scan history (max 50 entries)
-        self.vin_history = []
+        # Initialize VIN scan history (max 50 entries, newest first - appendleft evicts the oldest)
+        self.vin_history = collections.deque(maxlen=50)
         # Use absolute paths to ensure we're working with the right directory
         script_dir = os.path.dirname(os.path.abspath(__file__))
         self.vin_history_dir = os.path.join(script_dir, 'vin_history')
         self.vin_history_index_file = os.path.join(self.vin_history_dir, 'index.json')
-        self.init_vin_history_directory()
-        self.load_vin_history_from_files()
-        
-        # Ensure history display is updated after loading
-        if hasattr(self, 'vin_history_tree') and self.vin_history:
-            self.update_vin_history_display()
+        # History files are written from worker threads - serialize index writes and
+        # version the snapshots so an older index never overwrites a newer one
+        self._index_lock = threading.Lock()
+        self._index_version = 0
+        self._index_written_version = 0
+        self._index_dirty = False
+        
+        # Decoded VINs (VIN -> vehicle_info) - a VIN always decodes the same, so repeats skip NHTSA.
+        # Most recently used last, saved to vin_history/vin_cache.json on exit.
+        self.vin_cache_file = os.path.join(self.vin_history_dir, 'vin_cache.json')
+        self._vin_cache = collections.OrderedDict()
+        self._vin_cache_dirty = False
+        # The bootstrap worker merges the saved cache while a scan may already be decoding
+        self._vin_cache_lock = threading.Lock()
+        
+        # Load history from disk on the worker once the window has painted
+        self.root.after_idle(lambda: self.executor.submit(self._bootstrap_history))
+        
+        # Start polling for updates posted by the background worker
+        self.root.after(50, self._drain_queue)
+    
+    def _drain_queue(self):
+        """Apply UI updates posted by the background worker (runs on the Tk thread)"""
+        # Consecutive log lines are joined into a single Text insert
+        debug_chunks = []
+        try:
+            while True:
+                kind, payload = self.ui_queue.get_nowait()
+                if kind == 'append_debug':
+                    debug_chunks.append(payload)
+                    continue
+                
+                # Keep the log in order with anything the other updates write to it
+                self._flush_debug(debug_chunks)
+                if kind == 'part_tabs':
+                    for part_name in payload:
+                        self.create_part_tab(part_name)
+                elif kind == 'part_table':
+                    self._fill_part_table(*payload)
+                elif kind == 'final_output':
+                    self.display_results(*payload)
+                elif kind == 'history_loaded':
+                    self._on_history_loaded(*payload)
+                elif kind == 'add_history':
+                    self.add_to_vin_history(*payload)
+                    # Switch to the Final Output tab to show the results
+                    self.notebook.select(self.final_output_frame)
+                elif kind == 'done':
+                    self.calculate_btn.config(state='normal')
+        except queue.Empty:
+            pass
+        except Exception as e:
+            print(f"Failed to apply UI update: {e}")
+        finally:
+            self._flush_debug(debug_chunks)
+            self.root.after(50, self._drain_queue)
+    
+    def _flush_debug(self, debug_chunks):
+        """Write buffered log text to the debug tab in one insert"""
+        if debug_chunks:
+            self.results_text.insert(tk.END, ''.join(debug_chunks))
+            self.results_text.see(tk.END)
+            debug_chunks.clear()
+    
+    def _log(self, text):
+        """Append text to the debug tab (safe to call from the worker thread)"""
+        self.ui_queue.put(('append_debug', text))
+    
+    def on_close(self):
+        """Stop background work and close the window"""
+        self._closing.set()
+        # Queued history writes are left to finish before the process exits
+        if self._index_dirty:
+            self._index_dirty = False
+            self.save_history_index()
+        if self._vin_cache_dirty:
+            self._save_vin_cache()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.io_executor.shutdown(wait=False)
+        self.http.close()
+        if self.search_cache:
+            self.search_cache.close()
+        self.root.destroy()
+    
+    def _create_http_session(self):
+        """Create a pooled requests session with retries on transient errors"""
+        session = requests.Session()
+        # POST is included so the token request is retried too; Retry-After on 429 is honoured
+        retry = _JitterRetry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                             respect_retry_after_header=True,
+                             allowed_methods=frozenset({'GET', 'POST'}))
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry)
+        session.mount('https://api.ebay.com', adapter)
+        session.mount('https://api.sandbox.ebay.com', adapter)
+        # NHTSA is one request at a time and decode_vin already retries with longer timeouts
+        session.mount('https://vpic.nhtsa.dot.gov',
+                      HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+        session.headers.update({'Accept-Encoding': 'gzip', 'User-Agent': 'phx-auction/1.0'})
+        return session
+    
+    def _init_search_cache(self):
+        """Open the on-disk cache of eBay search responses (vin_history/ebay_cache.db)"""
+        # eBay prices don't move much within a day, so repeat searches are served from disk
+        self.search_cache_ttl = float(os.getenv('EBAY_CACHE_TTL_HOURS', '24')) * 3600
+        self._cache_lock = threading.Lock()
+        try:
+            os.makedirs(self.vin_history_dir, exist_ok=True)
+            self.search_cache = sqlite3.connect(os.path.join(self.vin_history_dir, 'ebay_cache.db'),
+                                                check_same_thread=False)
+            self.search_cache.execute('PRAGMA journal_mode=WAL')
+            self.search_cache.execute('CREATE TABLE IF NOT EXISTS cache(key TEXT PRIMARY KEY, ts REAL, body BLOB)')
+            self.search_cache.commit()
+        except Exception as e:
+            print(f"Failed to open eBay search cache: {e}")
+            self.search_cache = None
+    
+    def _search_cache_key(self, search_url, params):
+        """Hash the endpoint and query parameters into a cache key"""
+        query_string = search_url + '?' + '&'.join(f"{key}={params[key]}" for key in sorted(params))
+        return hashlib.sha1(query_string.encode('utf-8')).hexdigest()
+    
+    def _get_cached_search(self, key):
+        """Return the cached eBay response for key, or None if missing/expired"""
+        if not self.search_cache:
+            return None
+        try:
+            with self._cache_lock:
+                row = self.search_cache.execute('SELECT ts, body FROM cache WHERE key=?', (key,)).fetchone()
+            if row and time.time() - row[0] < self.search_cache_ttl:
+                return _json_loads(row[1])
+        except Exception as e:
+            print(f"Failed to read eBay search cache: {e}")
+        return None
+    
+    def _store_cached_search(self, key, body):
+        """Store a raw eBay response body in the cache"""
+        if not self.search_cache:
+            return
+        try:
+            with self._cache_lock:
+                self.search_cache.execute('INSERT OR REPLACE INTO cache(key, ts, body) VALUES (?, ?, ?)',
+                                          (key, time.time(), body))
+                self.search_cache.commit()
+        except Exception as e:
+            print(f"Failed to write eBay search cache: {e}")
+    
+    def clear_cached_results(self):
+        """Drop cached eBay searches and AI analyses so the next scan fetches fresh prices"""
+        try:
+            if self.search_cache:
+                with self._cache_lock:
+                    self.search_cache.execute('DELETE FROM cache')
+                    self.search_cache.commit()
+            with self._ai_cache_lock:
+                self._ai_cache.clear()
+            messagebox.showinfo("Cache Cleared", "Cached eBay searches and AI analyses were cleared.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to clear cache: {str(e)}")
     
     def setup_vin_history_tab(self):
         """Set up the VIN History tab with table display"""
@@ -204,9 +735,16 @@ class PhoenixAuctionAssistant:
         main_frame.grid_rowconfigure(2, weight=1)
         main_frame.grid_columnconfigure(0, weight=1)
         
+        # Map tree item IDs to their history entries so rows can be added/removed individually
+        self._history_entry_by_item = {}
+        
         # Bind double-click event to view details
         self.vin_history_tree.bind('<Double-1>', self.on_history_double_click)
         
+        # Full table rebuilds wait until the tab is actually shown
+        self._vin_history_dirty = False
+        self.notebook.bind('<<NotebookTabChanged>>', self._maybe_refresh_history, add='+')
+        
         # Control buttons
         button_frame = ttk.Frame(main_frame)
         button_frame.grid(row=4, column=0, columnspan=2, pady=(10, 0), sticky=tk.W)
@@ -224,9 +762,10 @@ class PhoenixAuctionAssistant:
         export_history_btn.grid(row=0, column=2)
     
     def add_to_vin_history(self, vin, vehicle_info, parts_prices, bid_analysis):
-        """Add a completed VIN scan to the history"""
-        import datetime
+        """Add a completed VIN scan to the history
         
+        The dicts are stored by reference - callers must not mutate them afterwards.
+        """
         # Create history entry
         timestamp = datetime.datetime.now()
         
@@ -235,11 +774,13 @@ class PhoenixAuctionAssistant:
         low_confidence_parts = []
         
         for part, prices in parts_prices.items():
-            if isinstance(prices, dict):
-                if prices.get('low', 0) == 0 and prices.get('average', 0) == 0 and prices.get('high', 0) == 0:
-                    failed_parts.append(part)
-                elif prices.get('confidence_rating', 'yellow') in ['orange', 'red']:
-                    low_confidence_parts.append(part)
+            if not isinstance(prices, dict):
+                continue
+            low, avg, high = prices.get('low', 0), prices.get('average', 0), prices.get('high', 0)
+            if not (low or avg or high):
+                failed_parts.append(part)
+            elif prices.get('confidence_rating', 'yellow') in LOW_CONF_SET:
+                low_confidence_parts.append(part)
         
         # Determine status
         if failed_parts:
@@ -254,59 +795,73 @@ class PhoenixAuctionAssistant:
         if vehicle_info.get('trim'):
             vehicle_str += f" {vehicle_info['trim']}"
         
-        history_entry = {
-            'timestamp': timestamp,
-            'vin': vin,
-            'vehicle_info': vehicle_info.copy(),
-            'vehicle_string': vehicle_str.strip(),
-            'parts_prices': parts_prices.copy(),
-            'bid_analysis': bid_analysis.copy(),
-            'status': status,
-            'failed_parts': failed_parts,
-            'low_confidence_parts': low_confidence_parts,
-            'filename': None  # Will be set during save
-        }
+        history_entry = VinHistoryEntry(
+            timestamp=timestamp,
+            vin=vin,
+            vehicle_info=vehicle_info,
+            vehicle_string=vehicle_str.strip(),
+            parts_prices=parts_prices,
+            bid_analysis=bid_analysis,
+            status=status,
+            failed_parts=failed_parts,
+            low_confidence_parts=low_confidence_parts,
+            filename=None  # Will be set during save
+        )
+        
+        # Add to beginning of history list (the deque drops the oldest beyond 50 entries)
+        self.vin_history.appendleft(history_entry)
+        
+        # Prepend just the new row instead of rebuilding the whole table
+        # (skipped if a rebuild is already pending for when the tab is next shown)
+        if not self._vin_history_dirty:
+            item_id = self.vin_history_tree.insert('', 0, values=self._history_row_values(history_entry))
+            self._history_entry_by_item[item_id] = history_entry
+            
+            # Evict the row of any entry the deque dropped
+            for stale_item in self.vin_history_tree.get_children()[self.vin_history.maxlen:]:
+                self.vin_history_tree.delete(stale_item)
+                self._history_entry_by_item.pop(stale_item, None)
         
-        # Add to beginning of history list
-        self.vin_history.insert(0, history_entry)
+        # Save to file
+        self.save_vin_analysis_to_file(history_entry)
+    
+    def _history_row_values(self, entry):
+        """Format a history entry as a row of the VIN history table"""
+        timestamp_str = entry.timestamp.strftime("%m/%d/%y %H:%M")
         
-        # Keep only most recent 50 entries
-        if len(self.vin_history) > 50:
-            self.vin_history = self.vin_history[:50]
+        # Calculate parts total (use budget tier as representative total)
+        totals = entry.totals
+        parts_total = f"${totals['low']:.2f}"
         
-        # Update the history table display
-        self.update_vin_history_display()
+        bids = entry.bids
+        budget_bid = f"${bids['low']:.2f}"
+        standard_bid = f"${bids['average']:.2f}"
+        premium_bid = f"${bids['high']:.2f}"
         
-        # Save to file
-        self.save_vin_analysis_to_file(history_entry)
+        return (timestamp_str, entry.vin, entry.vehicle_string, parts_total,
+                budget_bid, standard_bid, premium_bid, entry.status)
     
     def update_vin_history_display(self):
-        """Update the VIN history table display"""
-        # Clear existing items
-        for item in self.vin_history_tree.get_children():
-            self.vin_history_tree.delete(item)
-        
-        # Add items to table
-        for index, entry in enumerate(self.vin_history):
-            timestamp_str = entry['timestamp'].strftime("%m/%d/%y %H:%M")
-            vin = entry['vin']
-            vehicle = entry['vehicle_string']
-            
-            # Calculate parts total (use budget tier as representative total)
-            totals = entry['bid_analysis']['totals']
-            parts_total = f"${totals['low']:.2f}"
-            
-            bids = entry['bid_analysis']['bids']
-            budget_bid = f"${bids['low']:.2f}"
-            standard_bid = f"${bids['average']:.2f}"
-            premium_bid = f"${bids['high']:.2f}"
-            
-            status = entry['status']
+        """Rebuild the VIN history table display (used on load/clear)"""
+        # Detach the tree while rebuilding so Tk repaints once instead of per row
+        self.vin_history_tree.grid_remove()
+        try:
+            # Clear existing items
+            self.vin_history_tree.delete(*self.vin_history_tree.get_children())
+            self._history_entry_by_item = {}
             
-            # Store the entry index as a tag for easy removal
-            item_id = self.vin_history_tree.insert('', 'end', values=(
-                timestamp_str, vin, vehicle, parts_total, budget_bid, standard_bid, premium_bid, status
-            ), tags=(str(index),))
+            # Add items to table
+            for entry in self.vin_history:
+                item_id = self.vin_history_tree.insert('', 'end', values=self._history_row_values(entry))
+                self._history_entry_by_item[item_id] = entry
+        finally:
+            self.vin_history_tree.grid()
+    
+    def _maybe_refresh_history(self, event=None):
+        """Rebuild the history table if it's out of date and the VIN History tab is showing"""
+        if self._vin_history_dirty and self.notebook.select() == str(self.vin_history_frame):
+            self._vin_history_dirty = False
+            self.update_vin_history_display()
     
     def remove_selected_history(self):
         """Remove selected entries from VIN history"""
@@ -323,44 +878,36 @@ class PhoenixAuctionAssistant:
             message = f"Remove {num_selected} selected entries? This cannot be undone."
         
         if messagebox.askyesno("Confirm Removal", message):
-            # Get indices of selected items using tags
-            indices_to_remove = []
+            removed_ids = set()
             for item in selected_items:
-                # Get the index from the item's tag
-                tags = self.vin_history_tree.item(item, 'tags')
-                if tags:
-                    index = int(tags[0])
-                    indices_to_remove.append(index)
-            
-            # Sort indices in reverse order to remove from the end first
-            indices_to_remove.sort(reverse=True)
-            
-            # Remove entries from history list and delete associated files
-            for index in indices_to_remove:
-                if 0 <= index < len(self.vin_history):
-                    entry = self.vin_history[index]
-                    # Delete the associated JSON file if it exists
-                    if 'filename' in entry:
-                        filepath = os.path.join(self.vin_history_dir, entry['filename'])
-                        try:
-                            if os.path.exists(filepath):
-                                os.remove(filepath)
-                        except Exception as e:
-                            print(f"Warning: Could not delete file {filepath}: {e}")
-                    
-                    # Remove from history list
-                    del self.vin_history[index]
+                entry = self._history_entry_by_item.pop(item, None)
+                if entry is None:
+                    continue
+                
+                # Delete the associated JSON file (already gone is fine)
+                if entry.filename:
+                    filepath = os.path.join(self.vin_history_dir, entry.filename)
+                    try:
+                        os.remove(filepath)
+                    except FileNotFoundError:
+                        pass
+                    except Exception as e:
+                        print(f"Warning: Could not delete file {filepath}: {e}")
+                
+                removed_ids.add(id(entry))
             
-            # Update display and save
-            self.update_vin_history_display()
-            self.save_history_index()
+            # Remove entries from history list and only the affected rows from the table
+            self.vin_history = collections.deque(
+                (entry for entry in self.vin_history if id(entry) not in removed_ids), maxlen=50)
+            self.vin_history_tree.delete(*selected_items)
+            self._index_dirty = True  # Written by the next _flush_index_if_dirty
 
     def clear_vin_history(self):
         """Clear the VIN history"""
         if messagebox.askyesno("Confirm Clear", "Clear all VIN history? This cannot be undone."):
             self.vin_history.clear()
             self.update_vin_history_display()
-            self.save_history_index()  # Update index after clearing
+            self._index_dirty = True  # Update index after clearing
     
     def export_vin_history(self):
         """Export VIN history to CSV file"""
@@ -369,9 +916,6 @@ class PhoenixAuctionAssistant:
             return
         
         try:
-            import tkinter.filedialog as filedialog
-            import datetime
-            
             # Get save location
             default_filename = f"vin_history_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
             filename = filedialog.asksaveasfilename(
@@ -381,7 +925,7 @@ class PhoenixAuctionAssistant:
             )
             
             if filename:
-                with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+                with open(filename, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
                     writer = csv.writer(csvfile)
                     
                     # Write header
@@ -390,37 +934,41 @@ class PhoenixAuctionAssistant:
                         'Status', 'Failed Parts', 'Low Confidence Parts'
                     ])
                     
-                    # Write data
-                    for entry in self.vin_history:
-                        writer.writerow([
-                            entry['timestamp'].strftime("%m/%d/%Y %H:%M:%S"),
-                            entry['vin'],
-                            entry['vehicle_string'],
-                            f"${entry['bid_analysis']['totals']['low']:.2f}",
-                            f"${entry['bid_analysis']['bids']['low']:.2f}",
-                            f"${entry['bid_analysis']['bids']['average']:.2f}",
-                            f"${entry['bid_analysis']['bids']['high']:.2f}",
-                            entry['status'],
-                            ', '.join(entry['failed_parts']) if entry['failed_parts'] else '',
-                            ', '.join(entry['low_confidence_parts']) if entry['low_confidence_parts'] else ''
-                        ])
+                    # Write data (rows are generated one at a time)
+                    writer.writerows(self._history_rows())
                 
                 messagebox.showinfo("Export Complete", f"VIN history exported to {filename}")
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to export VIN history: {str(e)}")
     
+    def _history_rows(self):
+        """Yield one CSV export row per VIN history entry"""
+        for entry in self.vin_history:
+            totals = entry.totals
+            bids = entry.bids
+            yield (
+                entry.timestamp.strftime("%m/%d/%Y %H:%M:%S"),
+                entry.vin,
+                entry.vehicle_string,
+                f"${totals['low']:.2f}",
+                f"${bids['low']:.2f}",
+                f"${bids['average']:.2f}",
+                f"${bids['high']:.2f}",
+                entry.status,
+                ', '.join(entry.failed_parts),
+                ', '.join(entry.low_confidence_parts)
+            )
+    
     def on_history_double_click(self, event):
         """Handle double-click on history entry to show details"""
         selection = self.vin_history_tree.selection()
         if not selection:
             return
         
-        # Get the selected item index
-        item = selection[0]
-        index = self.vin_history_tree.index(item)
+        # Look up the entry for the selected row
+        entry = self._history_entry_by_item.get(selection[0])
         
-        if index < len(self.vin_history):
-            entry = self.vin_history[index]
+        if entry is not None:
             # Load full analysis data if needed
             full_entry = self.load_full_analysis(entry)
             self.show_history_details(full_entry)
@@ -430,7 +978,7 @@ class PhoenixAuctionAssistant:
         
         # Create popup window
         detail_window = tk.Toplevel(self.root)
-        detail_window.title(f"VIN Details - {entry['vin']}")
+        detail_window.title(f"VIN Details - {entry.vin}")
         detail_window.geometry("800x600")
         detail_window.resizable(True, True)
         
@@ -441,10 +989,10 @@ class PhoenixAuctionAssistant:
         detail_window.grid_columnconfigure(0, weight=1)
         
         # Header info
-        header_text = f"VIN: {entry['vin']}\n"
-        header_text += f"Scanned: {entry['timestamp'].strftime('%m/%d/%Y at %H:%M:%S')}\n"
-        header_text += f"Vehicle: {entry['vehicle_string']}\n"
-        header_text += f"Status: {entry['status']}\n\n"
+        header_text = f"VIN: {entry.vin}\n"
+        header_text += f"Scanned: {entry.timestamp.strftime('%m/%d/%Y at %H:%M:%S')}\n"
+        header_text += f"Vehicle: {entry.vehicle_string}\n"
+        header_text += f"Status: {entry.status}\n\n"
         
         # Create text widget for details
         detail_text = tk.Text(main_frame, height=30, width=80, wrap=tk.WORD)
@@ -458,20 +1006,20 @@ class PhoenixAuctionAssistant:
         main_frame.grid_rowconfigure(0, weight=1)
         main_frame.grid_columnconfigure(0, weight=1)
         
-        # Populate with analysis data
-        detail_text.insert(tk.END, header_text)
+        # Build the whole report first and insert it with a single Tcl call
+        lines = [header_text]
         
         # Recreate the analysis display format
-        vehicle_info = entry['vehicle_info']
-        parts_prices = entry['parts_prices']
-        bid_analysis = entry['bid_analysis']
+        vehicle_info = entry.vehicle_info or {}
+        parts_prices = entry.parts_prices or {}
+        bid_analysis = entry.bid_analysis
         
         # Display comprehensive vehicle information
-        base_vehicle = f"{vehicle_info['year']} {vehicle_info['make']} {vehicle_info['model']}"
+        base_vehicle = f"{vehicle_info.get('year', '')} {vehicle_info.get('make', '')} {vehicle_info.get('model', '')}"
         if vehicle_info.get('trim'):
-            detail_text.insert(tk.END, f"Full Vehicle: {base_vehicle} {vehicle_info['trim']}\n")
+            lines.append(f"Full Vehicle: {base_vehicle} {vehicle_info['trim']}\n")
         else:
-            detail_text.insert(tk.END, f"Vehicle: {base_vehicle}\n")
+            lines.append(f"Vehicle: {base_vehicle}\n")
         
         # Add vehicle specifications
         spec_lines = []
@@ -495,61 +1043,53 @@ class PhoenixAuctionAssistant:
             spec_lines.append(f"Body: {vehicle_info['body_class']}")
         
         if spec_lines:
-            detail_text.insert(tk.END, f"Specs: {' | '.join(spec_lines)}\n\n")
+            lines.append(f"Specs: {' | '.join(spec_lines)}\n\n")
         
         # Display parts breakdown with confidence
-        confidence_display = {
-            'dark_green': '🟢 High',
-            'light_green': '🟢 Good', 
-            'yellow': '🟡 Medium',
-            'orange': '🟠 Low',
-            'red': '🔴 Poor'
-        }
-        
-        detail_text.insert(tk.END, f"{'Part':<20} {'Budget':<10} {'Standard':<10} {'Premium':<10} {'Confidence':<15}\n")
-        detail_text.insert(tk.END, f"{'Tier':<20} {'Tier':<10} {'Tier':<10} {'Tier':<10} {'Rating':<15}\n")
-        detail_text.insert(tk.END, "-" * 80 + "\n")
+        lines.append(f"{'Part':<20} {'Budget':<10} {'Standard':<10} {'Premium':<10} {'Confidence':<15}\n")
+        lines.append(f"{'Tier':<20} {'Tier':<10} {'Tier':<10} {'Tier':<10} {'Rating':<15}\n")
+        lines.append("-" * 80 + "\n")
         
         for part, prices in parts_prices.items():
             if isinstance(prices, dict):
-                low = prices.get('low', 0)
-                avg = prices.get('average', 0)
-                high = prices.get('high', 0)
                 confidence = prices.get('confidence_rating', 'yellow')
-                confidence_text = confidence_display.get(confidence, '🟡 Unknown')
-                detail_text.insert(tk.END, f"{part.capitalize():<20} ${low:<9.2f} ${avg:<9.2f} ${high:<9.2f} {confidence_text:<15}\n")
+                confidence_text = _CONFIDENCE_DISPLAY.get(confidence, '🟡 Unknown')
+                lines.append(_ROW_FMT(part.capitalize(), prices.get('low', 0), prices.get('average', 0),
+                                      prices.get('high', 0), confidence_text))
         
         # Display totals and bids
         totals = bid_analysis['totals']
         bids = bid_analysis['bids']
         
-        detail_text.insert(tk.END, "-" * 80 + "\n")
-        detail_text.insert(tk.END, f"{'TOTALS:':<20} ${totals['low']:<9.2f} ${totals['average']:<9.2f} ${totals['high']:<9.2f}\n\n")
+        lines.append("-" * 80 + "\n")
+        lines.append(f"{'TOTALS:':<20} ${totals['low']:<9.2f} ${totals['average']:<9.2f} ${totals['high']:<9.2f}\n\n")
         
-        detail_text.insert(tk.END, "RECOMMENDED AUCTION BIDS (Dynamic Formula):\n")
-        detail_text.insert(tk.END, f"Budget-based bid:    ${bids['low']:.2f}  (if you expect lower-grade parts)\n")
-        detail_text.insert(tk.END, f"Standard bid:        ${bids['average']:.2f}  (typical market pricing)\n")
-        detail_text.insert(tk.END, f"Premium bid:         ${bids['high']:.2f}  (if vehicle is in great condition)\n\n")
+        lines.append("RECOMMENDED AUCTION BIDS (Dynamic Formula):\n")
+        lines.append(f"Budget-based bid:    ${bids['low']:.2f}  (if you expect lower-grade parts)\n")
+        lines.append(f"Standard bid:        ${bids['average']:.2f}  (typical market pricing)\n")
+        lines.append(f"Premium bid:         ${bids['high']:.2f}  (if vehicle is in great condition)\n\n")
         
         # Show confidence warnings if any
-        if entry['low_confidence_parts']:
-            detail_text.insert(tk.END, "⚠️  CONFIDENCE WARNINGS:\n")
-            for part in entry['low_confidence_parts']:
+        if entry.low_confidence_parts:
+            lines.append("⚠️  CONFIDENCE WARNINGS:\n")
+            for part in entry.low_confidence_parts:
                 confidence = parts_prices[part].get('confidence_rating', 'yellow')
-                detail_text.insert(tk.END, f"• {part.capitalize()}: {confidence_display.get(confidence, confidence)} confidence\n")
-            detail_text.insert(tk.END, "\n")
+                lines.append(f"• {part.capitalize()}: {_CONFIDENCE_DISPLAY.get(confidence, confidence)} confidence\n")
+            lines.append("\n")
         
         # Show confidence explanations
-        detail_text.insert(tk.END, "AI CONFIDENCE EXPLANATIONS:\n")
+        lines.append("AI CONFIDENCE EXPLANATIONS:\n")
         for part, prices in parts_prices.items():
             if isinstance(prices, dict):
                 confidence_explanation = prices.get('confidence_explanation', '')
                 if confidence_explanation:
-                    detail_text.insert(tk.END, f"• {part.capitalize()}: {confidence_explanation}\n")
+                    lines.append(f"• {part.capitalize()}: {confidence_explanation}\n")
         
         # Show failed parts if any
-        if entry['failed_parts']:
-            detail_text.insert(tk.END, f"\nFAILED PARTS: {', '.join(entry['failed_parts'])}\n")
+        if entry.failed_parts:
+            lines.append(f"\nFAILED PARTS: {', '.join(entry.failed_parts)}\n")
+        
+        detail_text.insert(tk.END, "".join(lines))
         
         # Make text read-only
         detail_text.configure(state='disabled')
@@ -574,10 +1114,7 @@ class PhoenixAuctionAssistant:
             model = vehicle_info.get('model', 'Unknown')
             
             # Clean up the strings for filename use
-            import re
-            year = re.sub(r'[^\w]', '', str(year))
-            make = re.sub(r'[^\w]', '', str(make))
-            model = re.sub(r'[^\w]', '', str(model))
+            year, make, model = (_SAFE_CHARS_RE.sub('', str(value)) for value in (year, make, model))
             
             # Create timestamp for uniqueness
             timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -589,163 +1126,321 @@ class PhoenixAuctionAssistant:
             return f"vin_analysis_{timestamp}.json"
     
     def save_vin_analysis_to_file(self, history_entry):
-        """Save individual VIN analysis to organized JSON file"""
+        """Save individual VIN analysis to organized JSON file (written on the worker pool)"""
         try:
             # Generate filename based on vehicle info
-            filename = self.generate_vehicle_filename(history_entry['vehicle_info'])
+            filename = self.generate_vehicle_filename(history_entry.vehicle_info)
             filepath = os.path.join(self.vin_history_dir, filename)
             
-            # Create a deep copy and prepare for JSON serialization
-            entry_copy = {}
-            for key, value in history_entry.items():
-                if key == 'timestamp':
-                    entry_copy[key] = value.isoformat()
-                elif isinstance(value, dict):
-                    entry_copy[key] = dict(value)  # Deep copy dictionaries
-                elif isinstance(value, list):
-                    entry_copy[key] = list(value)  # Deep copy lists
-                else:
-                    entry_copy[key] = value
+            # Update the original entry with filename
+            history_entry.filename = filename  # Store filename reference
             
-            entry_copy['filename'] = filename  # Store filename reference
+            # A shallow dict is enough - the serializer walks nested dicts/lists itself
+            # (the datetime timestamp is serialized by _write_json_atomic)
+            entry_copy = history_entry.to_dict()
             
+            # Snapshot the index here; the file writes happen off the UI thread
+            index_data, version = self._build_history_index()
+            self.io_executor.submit(self._persist_entry, filepath, entry_copy, index_data, version)
+                
+        except Exception as e:
+            print(f"Failed to save VIN analysis: {e}")
+            traceback.print_exc()
+    
+    def _persist_entry(self, filepath, entry_copy, index_data, version):
+        """Write an analysis file and the history index (runs on the worker pool)"""
+        try:
             # Ensure directory exists
             os.makedirs(self.vin_history_dir, exist_ok=True)
             
             # Save individual analysis file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(entry_copy, f, indent=2, ensure_ascii=False)
-            
-            # Update the original entry with filename
-            history_entry['filename'] = filename
-            
-            # Update the history index
-            self.save_history_index()
-                
+            self._write_json_atomic(filepath, entry_copy)
         except Exception as e:
             print(f"Failed to save VIN analysis to {filepath}: {e}")
-            import traceback
             traceback.print_exc()
+        
+        # Update the history index
+        self._write_history_index(index_data, version)
+    
+    def _flush_index_if_dirty(self):
+        """Write the history index if it changed since the last flush (reschedules itself)"""
+        if self._index_dirty:
+            self._index_dirty = False
+            self.save_history_index()
+        self.root.after(500, self._flush_index_if_dirty)
     
     def save_history_index(self):
         """Save the history index (lightweight file with just basic info)"""
         try:
-            index_data = []
-            for entry in self.vin_history:
-                # Create safe copies of nested data
-                bids_copy = dict(entry['bid_analysis']['bids']) if 'bid_analysis' in entry and 'bids' in entry['bid_analysis'] else {}
-                totals_copy = dict(entry['bid_analysis']['totals']) if 'bid_analysis' in entry and 'totals' in entry['bid_analysis'] else {}
+            index_data, version = self._build_history_index()
+            self._write_history_index(index_data, version)
+        except Exception as e:
+            print(f"Failed to save history index: {e}")
+            traceback.print_exc()
+    
+    def _build_history_index(self):
+        """Snapshot the index entries for the current history, with a version number"""
+        index_data = []
+        for entry in self.vin_history:
+            # Create safe copies of nested data
+            bids_copy = dict(entry.bids)
+            totals_copy = dict(entry.totals)
+            
+            index_entry = {
+                'timestamp': entry.timestamp,
+                'vin': entry.vin,
+                'vehicle_string': entry.vehicle_string,
+                'filename': entry.filename,
+                'status': entry.status,
+                'bids': bids_copy,
+                'totals': totals_copy
+            }
+            index_data.append(index_entry)
+        
+        self._index_version += 1
+        return index_data, self._index_version
+    
+    def _write_history_index(self, index_data, version):
+        """Write an index snapshot unless a newer one is already on disk"""
+        try:
+            with self._index_lock:
+                if version < self._index_written_version:
+                    return
                 
-                index_entry = {
-                    'timestamp': entry['timestamp'].isoformat(),
-                    'vin': entry['vin'],
-                    'vehicle_string': entry['vehicle_string'],
-                    'filename': entry.get('filename', None),
-                    'status': entry['status'],
-                    'bids': bids_copy,
-                    'totals': totals_copy
-                }
-                index_data.append(index_entry)
-            
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.vin_history_index_file), exist_ok=True)
-            
-            with open(self.vin_history_index_file, 'w', encoding='utf-8') as f:
-                json.dump(index_data, f, indent=2, ensure_ascii=False)
+                # Ensure directory exists
+                os.makedirs(os.path.dirname(self.vin_history_index_file), exist_ok=True)
+                
+                # Compact JSON - the index is only read back by the app
+                self._write_json_atomic(self.vin_history_index_file, index_data, indent=False)
+                self._index_written_version = version
                 
         except Exception as e:
             print(f"Failed to save history index: {e}")
-            import traceback
             traceback.print_exc()
     
+    def _write_json_atomic(self, filepath, data, indent=True):
+        """Serialize data to JSON and atomically replace filepath (datetimes become ISO strings)"""
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            payload = orjson.dumps(data, option=option)
+        else:
+            payload = json.dumps(data, indent=2 if indent else None, ensure_ascii=False,
+                                 separators=None if indent else (',', ':'),
+                                 default=lambda value: value.isoformat()).encode('utf-8')
+        
+        # Write to a temp file first so a crash mid-write never leaves a truncated file
+        # (serialized up front, so this is a single buffered write)
+        tmp_path = filepath + '.tmp'
+        with open(tmp_path, 'wb', buffering=65536) as f:
+            f.write(payload)
+        os.replace(tmp_path, filepath)
+    
+    def _read_json(self, filepath):
+        """Read and parse a JSON file (orjson if available)"""
+        with open(filepath, 'rb', buffering=65536) as f:
+            raw = f.read()
+        return _json_loads(raw)
+    
+    def _load_vin_cache(self):
+        """Merge VIN decodes saved by a previous run into the in-memory cache"""
+        try:
+            saved = self._read_json(self.vin_cache_file)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"Failed to load VIN cache: {e}")
+            return
+        # Saved entries are older than anything decoded this session, so they go in front
+        with self._vin_cache_lock:
+            for vin, vehicle_info in reversed(list(saved.items())):
+                self._vin_cache.setdefault(vin, vehicle_info)
+                self._vin_cache.move_to_end(vin, last=False)
+            while len(self._vin_cache) > 500:
+                self._vin_cache.popitem(last=False)
+    
+    def _save_vin_cache(self):
+        """Write the VIN decode cache to disk (oldest first, so a reload keeps the order)"""
+        try:
+            with self._vin_cache_lock:
+                snapshot = dict(self._vin_cache)
+            self._write_json_atomic(self.vin_cache_file, snapshot, indent=False)
+            self._vin_cache_dirty = False
+        except Exception as e:
+            print(f"Failed to save VIN cache: {e}")
+    
+    def _bootstrap_history(self):
+        """Read the VIN history from disk (runs on the worker thread)"""
+        self.init_vin_history_directory()
+        self._load_vin_cache()
+        entries, index_stale = self.load_vin_history_from_files()
+        self.ui_queue.put(('history_loaded', (entries, index_stale)))
+    
+    def _on_history_loaded(self, entries, index_stale):
+        """Install the history loaded by _bootstrap_history and display it (UI thread)"""
+        # Scans that finished before loading completed are newer than anything on disk
+        pending = list(self.vin_history)
+        self.vin_history = collections.deque(pending + entries, maxlen=50)
+        self._vin_history_dirty = True
+        self._maybe_refresh_history()
+        
+        if index_stale or pending:
+            self._index_dirty = True
+    
     def load_vin_history_from_files(self):
-        """Load VIN history from organized JSON files"""
+        """Load VIN history entries from organized JSON files
+        
+        Returns (entries newest first, whether index.json needs rewriting). Does not touch Tk.
+        """
         try:
-            if os.path.exists(self.vin_history_index_file):
-                # Load from index file
-                with open(self.vin_history_index_file, 'r', encoding='utf-8') as f:
-                    index_data = json.load(f)
-                
-                self.vin_history = []
-                for index_entry in index_data:
-                    # Create lightweight entry for display
-                    entry = {
-                        'timestamp': datetime.datetime.fromisoformat(index_entry['timestamp']),
-                        'vin': index_entry['vin'],
-                        'vehicle_string': index_entry['vehicle_string'],
-                        'filename': index_entry.get('filename'),
-                        'status': index_entry['status'],
-                        'bid_analysis': {
-                            'bids': index_entry['bids'],
-                            'totals': index_entry['totals']
-                        },
-                        # Mark as lightweight entry
-                        'is_lightweight': True
-                    }
-                    self.vin_history.append(entry)
+            try:
+                index_data = self._read_json(self.vin_history_index_file)
+            except FileNotFoundError:
+                # No index file exists, scan directory for existing files
+                entries = self.scan_existing_files()
                 
-                # Ensure we don't exceed 50 entries
-                if len(self.vin_history) > 50:
-                    self.vin_history = self.vin_history[:50]
-                    self.save_history_index()
+                # Rebuild the index from the scanned files
+                return entries, bool(entries)
+            
+            entries = []
+            ts_cache = {}
+            _fromiso = datetime.datetime.fromisoformat
+            
+            # Index is newest first - only the 50 kept entries are worth parsing
+            for index_entry in index_data[:50]:
+                # Repeated timestamps (re-saved indexes, duplicate scans) are parsed once
+                ts_string = index_entry['timestamp']
+                timestamp = ts_cache.get(ts_string)
+                if timestamp is None:
+                    timestamp = ts_cache[ts_string] = _fromiso(ts_string)
                 
-                # Update the display if the tab is set up
-                if hasattr(self, 'vin_history_tree'):
-                    self.update_vin_history_display()
-            else:
-                # No index file exists, scan directory for existing files
-                self.scan_existing_files()
+                # Create lightweight entry for display (no parts_prices until opened)
+                entry = VinHistoryEntry(
+                    timestamp=timestamp,
+                    vin=index_entry['vin'],
+                    vehicle_string=index_entry['vehicle_string'],
+                    filename=index_entry.get('filename'),
+                    status=index_entry['status'],
+                    bid_analysis={
+                        'bids': index_entry['bids'],
+                        'totals': index_entry['totals']
+                    }
+                )
+                entries.append(entry)
+            
+            # Rewrite an oversized index so it's trimmed on disk too
+            return entries, len(index_data) > 50
                     
         except Exception as e:
             print(f"Failed to load VIN history: {e}")
-            self.vin_history = []
+            return [], False
     
     def scan_existing_files(self):
-        """Scan existing JSON files and rebuild index (for migration)"""
+        """Scan existing JSON files for history entries (for migration, rebuilds the index)"""
+        entries = []
         try:
-            if not os.path.exists(self.vin_history_dir):
-                return
-            
-            self.vin_history = []
-            files = [f for f in os.listdir(self.vin_history_dir) if f.endswith('.json') and f != 'index.json']
+            # scandir gives the full path and cached stat info without extra lookups per file
+            try:
+                with os.scandir(self.vin_history_dir) as it:
+                    files = [f for f in it if f.name.endswith('.json') and f.name not in ('index.json', 'vin_cache.json')]
+            except FileNotFoundError:
+                return entries
             
             # Sort by modification time (newest first)
-            files.sort(key=lambda x: os.path.getmtime(os.path.join(self.vin_history_dir, x)), reverse=True)
+            files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
             
-            for filename in files[:50]:  # Load max 50 most recent
-                filepath = os.path.join(self.vin_history_dir, filename)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        entry_data = json.load(f)
-                    
-                    # Convert back to runtime format
-                    entry_data['timestamp'] = datetime.datetime.fromisoformat(entry_data['timestamp'])
-                    entry_data['filename'] = filename
-                    self.vin_history.append(entry_data)
-                    
-                except Exception as e:
-                    print(f"Failed to load file {filename}: {e}")
+            recent = files[:50]  # Load max 50 most recent
+            
+            # Open files in inode order (closer to on-disk order on spinning disks), then put
+            # the results back in newest-first order. Reads overlap on a few threads.
+            read_order = sorted(range(len(recent)), key=lambda i: recent[i].inode())
+            results = [None] * len(recent)
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                loaded = pool.map(self._load_scanned_entry, [recent[i] for i in read_order])
+                for i, entry in zip(read_order, loaded):
+                    results[i] = entry
+            entries = [entry for entry in results if entry is not None]
             
-            # Save the rebuilt index
-            if self.vin_history:
-                self.save_history_index()
-                
         except Exception as e:
             print(f"Failed to scan existing files: {e}")
-            self.vin_history = []
+        
+        return entries
+    
+    def _load_scanned_entry(self, dir_entry):
+        """Build a lightweight history entry from one per-scan file (None if unreadable)"""
+        filename = dir_entry.name
+        try:
+            # Only the index fields are needed here - the rest is loaded on double-click
+            entry_data = self._read_index_fields(dir_entry.path)
+            if entry_data is None:
+                # Older layout with the index fields further down - parse the whole file
+                entry_data = self._read_json(dir_entry.path)
+                entry_data = {key: entry_data[key] for key in _INDEX_FIELDS if key in entry_data}
+            
+            # Convert back to runtime format (lightweight entry)
+            entry_data['filename'] = filename
+            return VinHistoryEntry.from_dict(entry_data)
+            
+        except Exception as e:
+            print(f"Failed to load file {filename}: {e}")
+            return None
+    
+    def _read_index_fields(self, filepath, prefix_size=4096):
+        """Parse the index fields from the start of a per-scan file without reading it all
+        
+        Decodes top-level key/value pairs from the first prefix_size characters and stops once
+        every index field is found. Returns None if they aren't all within the prefix.
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            prefix = f.read(prefix_size)
+        
+        found = {}
+        try:
+            pos = _JSON_WS_RE.match(prefix, 0).end()
+            if prefix[pos] != '{':
+                return None
+            pos += 1
+            while len(found) < len(_INDEX_FIELDS):
+                pos = _JSON_WS_RE.match(prefix, pos).end()
+                key, pos = _JSON_DECODER.raw_decode(prefix, pos)
+                pos = _JSON_WS_RE.match(prefix, pos).end()
+                if prefix[pos] != ':':
+                    return None
+                pos = _JSON_WS_RE.match(prefix, pos + 1).end()
+                value, pos = _JSON_DECODER.raw_decode(prefix, pos)
+                if key in _INDEX_FIELDS:
+                    found[key] = value
+                pos = _JSON_WS_RE.match(prefix, pos).end()
+                if prefix[pos] != ',':
+                    break
+                pos += 1
+        except (ValueError, IndexError):
+            # Ran off the end of the prefix (or the file is malformed)
+            return None
+        
+        return found if len(found) == len(_INDEX_FIELDS) else None
     
     def load_full_analysis(self, entry):
-        """Load full analysis data from file when needed (for detail view)"""
+        """Load full analysis data from file when needed (for detail view)
+        
+        index.json already holds the display fields, so this per-scan file is only read on
+        double-click. The detail view renders every part at once, so it's read whole.
+        """
         try:
-            if entry.get('is_lightweight') and entry.get('filename'):
-                filepath = os.path.join(self.vin_history_dir, entry['filename'])
-                if os.path.exists(filepath):
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        full_data = json.load(f)
-                    
-                    # Convert timestamp back
-                    full_data['timestamp'] = datetime.datetime.fromisoformat(full_data['timestamp'])
-                    return full_data
+            if entry.is_lightweight and entry.filename:
+                filepath = os.path.join(self.vin_history_dir, entry.filename)
+                try:
+                    full_data = self._read_json(filepath)
+                except FileNotFoundError:
+                    return entry
+                
+                # Fill in the history entry so repeat double-clicks don't re-read the file
+                # (the index fields are already set, keep those)
+                entry.vehicle_info = full_data.get('vehicle_info', {})
+                entry.parts_prices = full_data.get('parts_prices', {})
+                entry.failed_parts = full_data.get('failed_parts', [])
+                entry.low_confidence_parts = full_data.get('low_confidence_parts', [])
             
             # Return the entry as-is if it's already full or no file available
             return entry
@@ -817,9 +1512,8 @@ Save multiple instruction sets for different vehicle types or scenarios."""
         self.ai_instructions_text = tk.Text(main_frame, height=8, width=80, wrap=tk.WORD)
         self.ai_instructions_text.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
         
-        # Bind auto-save on text change
-        self.ai_instructions_text.bind('<KeyRelease>', lambda e: self.auto_save_instructions())
-        self.ai_instructions_text.bind('<Button-1>', lambda e: self.auto_save_instructions())
+        # Bind auto-save on text change (<<Modified>> skips clicks and navigation keys)
+        self.ai_instructions_text.bind('<<Modified>>', self._on_instructions_modified)
         
         # Add scrollbar for instructions
         instructions_scrollbar = ttk.Scrollbar(main_frame, orient="vertical", 
@@ -888,7 +1582,6 @@ Save multiple instruction sets for different vehicle types or scenarios."""
     
     def init_preset_system(self):
         """Initialize the preset system"""
-        import os
         # Create presets directory if it doesn't exist
         self.presets_dir = "ai_instruction_presets"
         if not os.path.exists(self.presets_dir):
@@ -896,21 +1589,31 @@ Save multiple instruction sets for different vehicle types or scenarios."""
         
         # Set up auto-save timer
         self.auto_save_timer = None
+        self._save_pending = False
+        # Hash of what's on disk, so unchanged instructions aren't rewritten
+        self._last_saved_hash = None
+        self._preset_saved_hashes = {}
+        # Stripped widget text, re-read only after the instructions box changes
+        self._cached_custom_instructions = None
+        
+        # Sorted preset names, rebuilt only after a save or delete
+        self._preset_cache = None
         
         # Load available presets
         self.refresh_preset_list()
     
     def refresh_preset_list(self):
         """Refresh the preset dropdown list"""
-        import os
-        presets = []
-        if os.path.exists(self.presets_dir):
-            for filename in os.listdir(self.presets_dir):
-                if filename.endswith('.txt'):
-                    preset_name = filename[:-4]  # Remove .txt extension
-                    presets.append(preset_name)
-        
-        presets.sort()
+        if self._preset_cache is None:
+            try:
+                with os.scandir(self.presets_dir) as it:
+                    # Remove .txt extension
+                    self._preset_cache = sorted(e.name[:-4] for e in it
+                                                if e.name.endswith('.txt') and e.is_file())
+            except FileNotFoundError:
+                self._preset_cache = []
+        
+        presets = self._preset_cache
         self.preset_combo['values'] = presets
         
         # Select default preset if available
@@ -927,16 +1630,18 @@ Save multiple instruction sets for different vehicle types or scenarios."""
             return
         
         # Sanitize filename
-        import re
-        safe_name = re.sub(r'[^\w\-_\.]', '_', preset_name)
+        safe_name = _PRESET_NAME_SAFE_RE.sub('_', preset_name)
         
         instructions = self.ai_instructions_text.get(1.0, tk.END).strip()
         
         try:
             preset_file = os.path.join(self.presets_dir, f"{safe_name}.txt")
-            with open(preset_file, 'w', encoding='utf-8') as f:
-                f.write(instructions)
+            content_hash = hash(instructions)
+            if self._preset_saved_hashes.get(safe_name) != content_hash:
+                self._write_text_atomic(preset_file, instructions)
+                self._preset_saved_hashes[safe_name] = content_hash
             
+            self._preset_cache = None
             self.refresh_preset_list()
             self.preset_var.set(safe_name)
             self.preset_name_var.set("")
@@ -957,6 +1662,8 @@ Save multiple instruction sets for different vehicle types or scenarios."""
                 instructions = f.read()
                 self.ai_instructions_text.delete(1.0, tk.END)
                 self.ai_instructions_text.insert(1.0, instructions)
+                self.ai_instructions_text.edit_modified(False)
+                self._cached_custom_instructions = None
                 
             self.show_auto_save_feedback("Preset loaded")
         except Exception as e:
@@ -970,10 +1677,11 @@ Save multiple instruction sets for different vehicle types or scenarios."""
         
         if messagebox.askyesno("Confirm Delete", f"Delete preset '{preset_name}'?"):
             try:
-                import os
                 preset_file = os.path.join(self.presets_dir, f"{preset_name}.txt")
                 os.remove(preset_file)
+                self._preset_saved_hashes.pop(preset_name, None)
                 
+                self._preset_cache = None
                 self.refresh_preset_list()
                 self.preset_var.set("")
                 
@@ -981,26 +1689,54 @@ Save multiple instruction sets for different vehicle types or scenarios."""
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete preset: {str(e)}")
     
+    def _on_instructions_modified(self, event=None):
+        """Handle <<Modified>> from the instructions text box"""
+        self._cached_custom_instructions = None
+        # Tk only fires <<Modified>> again after the flag is reset
+        if not self.ai_instructions_text.edit_modified():
+            return
+        self.ai_instructions_text.edit_modified(False)
+        self.auto_save_instructions()
+    
     def auto_save_instructions(self):
         """Auto-save instructions with a delay to avoid constant writes"""
         if self.auto_save_timer:
-            self.root.after_cancel(self.auto_save_timer)
+            # A save is already scheduled - just note that more input arrived
+            self._save_pending = True
+            return
         
         # Save after 2 seconds of inactivity
         self.auto_save_timer = self.root.after(2000, self._perform_auto_save)
     
     def _perform_auto_save(self):
         """Actually perform the auto-save"""
+        if self._save_pending:
+            # Still typing - wait for another quiet period
+            self._save_pending = False
+            self.auto_save_timer = self.root.after(2000, self._perform_auto_save)
+            return
+        self.auto_save_timer = None
+        
         instructions = self.ai_instructions_text.get(1.0, tk.END).strip()
+        content_hash = hash(instructions)
+        if content_hash == self._last_saved_hash:
+            return  # Nothing changed since the last save
         
         try:
-            with open('ai_instructions.txt', 'w', encoding='utf-8') as f:
-                f.write(instructions)
+            self._write_text_atomic('ai_instructions.txt', instructions)
+            self._last_saved_hash = content_hash
             
             self.show_auto_save_feedback("Auto-saved")
         except Exception as e:
             self.show_auto_save_feedback("Auto-save failed", error=True)
     
+    def _write_text_atomic(self, filepath, content):
+        """Write text to a temp file and swap it in, so a crash never truncates filepath"""
+        tmp_path = filepath + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, filepath)
+    
     def show_auto_save_feedback(self, message, error=False):
         """Show auto-save feedback temporarily"""
         color = "red" if error else "green"
@@ -1013,8 +1749,10 @@ Save multiple instruction sets for different vehicle types or scenarios."""
         """Manual save AI instructions to a file"""
         instructions = self.ai_instructions_text.get(1.0, tk.END).strip()
         try:
-            with open('ai_instructions.txt', 'w', encoding='utf-8') as f:
-                f.write(instructions)
+            content_hash = hash(instructions)
+            if content_hash != self._last_saved_hash:
+                self._write_text_atomic('ai_instructions.txt', instructions)
+                self._last_saved_hash = content_hash
             messagebox.showinfo("Saved", "AI instructions saved successfully!")
             self.show_auto_save_feedback("Manually saved")
         except Exception as e:
@@ -1024,6 +1762,7 @@ Save multiple instruction sets for different vehicle types or scenarios."""
         """Clear the AI instructions text area"""
         if messagebox.askyesno("Confirm Clear", "Clear all instructions? This cannot be undone."):
             self.ai_instructions_text.delete(1.0, tk.END)
+            self._cached_custom_instructions = None
             self.show_auto_save_feedback("Cleared")
     
     def load_ai_instructions(self):
@@ -1033,14 +1772,19 @@ Save multiple instruction sets for different vehicle types or scenarios."""
                 instructions = f.read()
                 self.ai_instructions_text.delete(1.0, tk.END)
                 self.ai_instructions_text.insert(1.0, instructions)
+                self.ai_instructions_text.edit_modified(False)
+                self._cached_custom_instructions = None
+                self._last_saved_hash = hash(instructions.strip())
         except FileNotFoundError:
             pass  # File doesn't exist yet, that's fine
         except Exception as e:
             print(f"Error loading AI instructions: {e}")
     
     def get_custom_ai_instructions(self):
-        """Get the current custom AI instructions"""
-        return self.ai_instructions_text.get(1.0, tk.END).strip()
+        """Get the current custom AI instructions (cached until the text box is edited)"""
+        if self._cached_custom_instructions is None:
+            self._cached_custom_instructions = self.ai_instructions_text.get(1.0, tk.END).strip()
+        return self._cached_custom_instructions
     
     def create_part_tab(self, part_name):
         """Create a new tab for a specific part in the Raw Search Results section"""
@@ -1082,46 +1826,82 @@ Save multiple instruction sets for different vehicle types or scenarios."""
         
         self.part_tables[part_name] = tree
     
-    def update_part_table(self, part_name, items):
-        """Update the table for a specific part with search results"""
+    def _format_part_rows(self, items):
+        """Sort items by total price and format them as table rows (no Tk - safe on the worker)"""
+        # Fill in any missing totals so the sort can use a plain itemgetter
+        for item in items:
+            if 'total_price' not in item:
+                item['total_price'] = item.get('price', 0) + item.get('shipping', 0)
+        
+        # Sort items by total price (price + shipping) and format all rows up front
+        return [
+            (f"${item.get('price', 0):.2f}",
+             "FREE" if item.get('shipping', 0) == 0 else f"${item.get('shipping', 0):.2f}",
+             f"${item['total_price']:.2f}",
+             item.get('title', 'No title'))
+            for item in sorted(items, key=operator.itemgetter('total_price'))
+        ]
+    
+    def _fill_part_table(self, part_name, rows):
+        """Replace a part table's contents with pre-formatted rows (UI thread)"""
         if part_name not in self.part_tables:
             self.create_part_tab(part_name)
         
         tree = self.part_tables[part_name]
         
-        # Clear existing items
-        for item in tree.get_children():
-            tree.delete(item)
-        
-        # Sort items by total price (price + shipping)
-        sorted_items = sorted(items, key=lambda x: x.get('total_price', x.get('price', 0)))
-        
-        # Add items to table
-        for item in sorted_items:
-            price = item.get('price', 0)
-            shipping = item.get('shipping', 0)
-            total_price = item.get('total_price', price + shipping)
-            title = item.get('title', 'No title')
-            
-            price_str = f"${price:.2f}"
-            shipping_str = "FREE" if shipping == 0 else f"${shipping:.2f}"
-            total_str = f"${total_price:.2f}"
-            
-            tree.insert('', 'end', values=(price_str, shipping_str, total_str, title))
+        # Detach the tree while rebuilding so Tk repaints once instead of per row
+        tree.grid_remove()
+        try:
+            tree.delete(*tree.get_children())
+            insert = tree.insert
+            for values in rows:
+                insert('', 'end', values=values)
+        finally:
+            tree.grid()
     
     def load_parts_list(self):
+        """Load parts_list.csv (skipped if the file hasn't changed since the last load)"""
         try:
-            with open('parts_list.csv', 'r') as file:
-                reader = csv.DictReader(file)
-                self.parts_list = []
+            mtime = os.stat('parts_list.csv').st_mtime
+            if mtime == getattr(self, '_parts_list_mtime', None):
+                return
+            
+            with open('parts_list.csv', 'r', newline='') as file:
+                reader = csv.reader(file)
+                header = next(reader, [])
+                query_col = header.index('search_query')
+                category_col = header.index('category_id')
+                min_price_col = header.index('min_price') if 'min_price' in header else None
+                
+                parts_list = []
+                append = parts_list.append
                 for row in reader:
-                    if row['search_query'] and row['category_id']:
-                        self.parts_list.append({
-                            'search_query': row['search_query'],
-                            'category_id': row['category_id'],
-                            'min_price': float(row.get('min_price', 0))
-                        })
-        except FileNotFoundError:
+                    if len(row) <= max(query_col, category_col):
+                        continue
+                    if not (row[query_col] and row[category_col]):
+                        continue
+                    # A blank min_price means no floor; a malformed one skips just that row
+                    cell = row[min_price_col] if min_price_col is not None and min_price_col < len(row) else ''
+                    try:
+                        min_price = float(cell) if cell.strip() else 0.0
+                    except ValueError:
+                        self._log(f"Skipping parts_list.csv row '{row[query_col]}': bad min_price {cell!r}\n")
+                        continue
+                    append({
+                        'search_query': row[query_col],
+                        'category_id': row[category_col],
+                        'min_price': min_price
+                    })
+            
+            self.parts_list = parts_list
+            self._parts_list_mtime = mtime
+        except Exception as e:
+            # Keep the list from the last good load; the defaults are only for a first load
+            if hasattr(self, '_parts_list_mtime'):
+                self._log(f"Could not reload parts_list.csv, keeping the current list: {e}\n")
+                return
+            if not isinstance(e, FileNotFoundError):
+                self._log(f"Could not load parts_list.csv, using the default parts: {e}\n")
             self.parts_list = [
                 {"search_query": "engine", "category_id": "33615"},
                 {"search_query": "transmission", "category_id": "33616"},
@@ -1129,79 +1909,59 @@ Save multiple instruction sets for different vehicle types or scenarios."""
             ]
     
     def decode_vin(self, vin: str) -> Optional[Dict]:
+        with self._vin_cache_lock:
+            cached = self._vin_cache.get(vin)
+            if cached is not None:
+                self._vin_cache.move_to_end(vin)
+        if cached is not None:
+            self._log("Using cached VIN decode\n")
+            return dict(cached)
+        
         url = f"https://vpic.nhtsa.dot.gov/api/vehicles/decodevin/{vin}?format=json"
         
         # Try 3 times with increasing timeout
         for attempt in range(3):
             try:
                 timeout = 15 + (attempt * 10)  # 15s, 25s, 35s
-                self.results_text.insert(tk.END, f"VIN decode attempt {attempt + 1} (timeout: {timeout}s)...\n")
-                self.root.update()
+                self._log(f"VIN decode attempt {attempt + 1} (timeout: {timeout}s)...\n")
                 
-                response = requests.get(url, timeout=timeout)
+                response = self.http.get(url, timeout=timeout)
                 response.raise_for_status()
                 
-                data = response.json()
+                data = _json_loads(response.content)
                 if data.get('Results'):
                     vehicle_info = {}
+                    displacement_values = {}
                     for result in data['Results']:
                         variable = result['Variable']
-                        value = result['Value']
-                        
-                        # Core vehicle identification
-                        if variable == 'Make':
-                            vehicle_info['make'] = value
-                        elif variable == 'Model':
-                            vehicle_info['model'] = value
-                        elif variable == 'Model Year':
-                            vehicle_info['year'] = value
-                        elif variable == 'Trim':
-                            vehicle_info['trim'] = value
                         
-                        # Engine specifications
-                        elif variable == 'Displacement (CC)' or variable == 'Displacement (L)':
-                            if value and value != 'null':
-                                # Convert CC to L if needed and round to nearest 10th
-                                try:
-                                    if variable == 'Displacement (CC)':
-                                        displacement_l = float(value) / 1000
-                                        vehicle_info['engine_displacement'] = str(round(displacement_l, 1))
-                                    else:
-                                        displacement_l = float(value)
-                                        vehicle_info['engine_displacement'] = str(round(displacement_l, 1))
-                                except (ValueError, TypeError):
-                                    vehicle_info['engine_displacement'] = value
-                        elif variable == 'Engine Number of Cylinders':
-                            if value and value != 'null':
-                                vehicle_info['engine_cylinders'] = value
-                        elif variable == 'Fuel Type - Primary':
-                            if value and value != 'null':
-                                vehicle_info['fuel_type'] = value
-                        elif variable == 'Engine Configuration':
-                            if value and value != 'null':
-                                vehicle_info['engine_configuration'] = value
-                        
-                        # Drive and transmission
-                        elif variable == 'Drive Type':
-                            if value and value != 'null':
-                                vehicle_info['drive_type'] = value
-                        elif variable == 'Transmission Style':
-                            if value and value != 'null':
-                                vehicle_info['transmission_style'] = value
-                        elif variable == 'Transmission Speeds':
-                            if value and value != 'null':
-                                vehicle_info['transmission_speeds'] = value
+                        # Core vehicle identification (kept even when empty)
+                        key = _VIN_CORE_FIELDS.get(variable)
+                        if key is not None:
+                            vehicle_info[key] = result['Value']
+                            continue
                         
-                        # Body specifications
-                        elif variable == 'Body Class':
-                            if value and value != 'null':
-                                vehicle_info['body_class'] = value
-                        elif variable == 'Doors':
-                            if value and value != 'null':
-                                vehicle_info['doors'] = value
-                        elif variable == 'Vehicle Type':
-                            if value and value != 'null':
-                                vehicle_info['vehicle_type'] = value
+                        key = _VIN_FIELD_MAP.get(variable)
+                        if key is None and variable not in _VIN_DISPLACEMENT_FIELDS:
+                            continue
+                        value = result['Value']
+                        if not value or value == 'null':
+                            continue
+                        if key is None:
+                            displacement_values[variable] = value
+                        else:
+                            vehicle_info[key] = value
+                    
+                    # Engine displacement - prefer liters, convert CC, round to nearest 10th
+                    for variable, divisor in _VIN_DISPLACEMENT_FIELDS.items():
+                        value = displacement_values.get(variable)
+                        if value is None:
+                            continue
+                        try:
+                            vehicle_info['engine_displacement'] = str(round(float(value) / divisor, 1))
+                        except (ValueError, TypeError):
+                            vehicle_info['engine_displacement'] = value
+                        break
                     
                     # Extract engine designation from VIN 8th digit
                     if len(vin) >= 8:
@@ -1229,33 +1989,142 @@ Save multiple instruction sets for different vehicle types or scenarios."""
                         if vehicle_info.get('engine_designation'):
                             additional_info.append(f"Engine Code: {vehicle_info['engine_designation']}")
                         
-                        self.results_text.insert(tk.END, f"VIN decoded successfully!\n")
+                        self._log(f"VIN decoded successfully!\n")
                         if additional_info:
-                            self.results_text.insert(tk.END, f"Additional specs: {', '.join(additional_info)}\n")
-                        self.root.update()
+                            self._log(f"Additional specs: {', '.join(additional_info)}\n")
+                        
+                        with self._vin_cache_lock:
+                            self._vin_cache[vin] = dict(vehicle_info)
+                            while len(self._vin_cache) > 500:
+                                self._vin_cache.popitem(last=False)
+                            self._vin_cache_dirty = True
                         return vehicle_info
                         
             except Exception as e:
-                self.results_text.insert(tk.END, f"Attempt {attempt + 1} failed: {str(e)}\n")
-                self.root.update()
+                self._log(f"Attempt {attempt + 1} failed: {str(e)}\n")
                 if attempt == 2:  # Last attempt
                     self.display_error(f"VIN decode failed after 3 attempts: {str(e)}")
                     return None
     
-    def get_ebay_access_token(self) -> bool:
-        # OPTIMIZATION 5: Check if existing token is still valid
-        import datetime
-        if (self.ebay_access_token and self.ebay_token_expiry and 
-            datetime.datetime.now() < self.ebay_token_expiry):
-            return True
+    def _ensure_ebay_token(self) -> bool:
+        """Make sure a valid eBay token is available, refreshing only near expiry"""
+        with self._token_lock:
+            if self._ebay_token_valid():
+                return True
+            
+            # Reuse a token persisted by a previous run before requesting a new one
+            self._load_cached_ebay_token()
+            if self._ebay_token_valid():
+                self._log("Using cached eBay token\n")
+                return True
+            
+            return self.get_ebay_access_token()
+    
+    def _ebay_token_valid(self) -> bool:
+        """Check whether the current token is still valid (with a 60 second margin)"""
+        return bool(self.ebay_access_token and self.ebay_token_expiry and
+                    datetime.datetime.now() < self.ebay_token_expiry - datetime.timedelta(seconds=60))
+    
+    def _load_cached_ebay_token(self):
+        """Load the eBay token saved to disk by an earlier session, if it has over 5 minutes left"""
+        try:
+            with open(self.ebay_token_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('environment', self.ebay_environment) != self.ebay_environment:
+                return
+            # Enough headroom for a full scan; a nearly expired token is left for OAuth to replace
+            expiry = datetime.datetime.fromisoformat(cached['expiry_iso'])
+            if datetime.datetime.now() >= expiry - datetime.timedelta(minutes=5):
+                return
+            self.ebay_access_token = cached['token']
+            self.ebay_token_expiry = expiry
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Failed to load cached eBay token: {e}")
+    
+    def _save_cached_ebay_token(self):
+        """Persist the current eBay token so restarts don't request a new one"""
+        try:
+            os.makedirs(os.path.dirname(self.ebay_token_file), exist_ok=True)
+            payload = json.dumps({
+                'token': self.ebay_access_token,
+                'expiry_iso': self.ebay_token_expiry.isoformat(),
+                'environment': self.ebay_environment
+            })
+            
+            # Owner-only permissions from the start, swapped in atomically
+            tmp_path = self.ebay_token_file + '.tmp'
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.ebay_token_file)
+        except Exception as e:
+            print(f"Failed to save eBay token: {e}")
+    
+    def _schedule_token_refresh(self):
+        """Check once a minute whether the eBay token is within 10 minutes of expiring (UI thread)"""
+        try:
+            if self.ebay_access_token and self._token_expiring_soon():
+                self.executor.submit(self._refresh_token_in_background)
+        finally:
+            self.root.after(60000, self._schedule_token_refresh)
+    
+    def _refresh_token_in_background(self):
+        """Fetch a new eBay token ahead of expiry so the next search doesn't wait on OAuth"""
+        with self._token_lock:
+            # Another refresh (or a search) may have renewed it already
+            if self._token_expiring_soon():
+                self.get_ebay_access_token()
+    
+    def _token_expiring_soon(self) -> bool:
+        """Whether the token expires within 10 minutes (an already-expired token is left to _ensure_ebay_token)"""
+        expiry = self.ebay_token_expiry
+        if not expiry:
+            return False
+        now = datetime.datetime.now()
+        return expiry - datetime.timedelta(minutes=10) < now < expiry
+    
+    def _refresh_ebay_token(self, stale_token) -> bool:
+        """Drop a token rejected with 401 and fetch a new one (once per stale token)"""
+        with self._token_lock:
+            if self.ebay_access_token == stale_token:
+                self.ebay_access_token = None
+                self.ebay_token_expiry = None
+                # The token file still holds the rejected token, so go straight to OAuth
+                return self.get_ebay_access_token()
+        return self._ensure_ebay_token()
+    
+    def reload_gemini(self, reload_env=True):
+        """(Re)build the shared Gemini model, only when the key or USE_AI_ANALYSIS changed"""
+        if reload_env:
+            load_dotenv(override=True)
+        api_key = os.getenv('GEMINI_API_KEY')
+        use_ai = os.getenv('USE_AI_ANALYSIS', 'true').lower() == 'true'
+        if (api_key, use_ai) == (self.gemini_api_key, self.use_ai_analysis):
+            return
         
-        self.results_text.insert(tk.END, "Authenticating with eBay...\n")
-        self.root.update()
+        self.gemini_api_key = api_key
+        self.use_ai_analysis = use_ai
+        self.gemini_model = None
+        if api_key and use_ai:
+            try:
+                genai.configure(api_key=api_key)
+                self.gemini_model = genai.GenerativeModel('gemini-2.0-flash-exp')
+            except Exception as e:
+                print(f"Failed to initialize Gemini model: {e}")
+    
+    def get_ebay_access_token(self) -> bool:
+        self._log("Authenticating with eBay...\n")
         
         # Reload credentials in case .env was updated
         load_dotenv(override=True)
-        self.ebay_client_id = os.getenv('EBAY_CLIENT_ID')
-        self.ebay_client_secret = os.getenv('EBAY_CLIENT_SECRET')
+        client_id = os.getenv('EBAY_CLIENT_ID')
+        client_secret = os.getenv('EBAY_CLIENT_SECRET')
+        if (client_id, client_secret) != (self.ebay_client_id, self.ebay_client_secret):
+            self.ebay_client_id = client_id
+            self.ebay_client_secret = client_secret
+            self._set_ebay_basic_auth()
         self.ebay_environment = os.getenv('EBAY_ENVIRONMENT', 'SANDBOX')
         
         if not self.ebay_client_id or not self.ebay_client_secret:
@@ -1271,13 +2140,12 @@ Save multiple instruction sets for different vehicle types or scenarios."""
             else:
                 oauth_url = "https://api.sandbox.ebay.com/identity/v1/oauth2/token"
             
-            self.results_text.insert(tk.END, f"Using environment: {self.ebay_environment}\n")
-            self.results_text.insert(tk.END, f"OAuth URL: {oauth_url}\n")
-            self.root.update()
+            self._log(f"Using environment: {self.ebay_environment}\n")
+            self._log(f"OAuth URL: {oauth_url}\n")
             
             headers = {
                 'Content-Type': 'application/x-www-form-urlencoded',
-                'Authorization': f'Basic {self._encode_credentials()}'
+                'Authorization': f'Basic {self._ebay_basic_auth}'
             }
             
             data = {
@@ -1285,29 +2153,26 @@ Save multiple instruction sets for different vehicle types or scenarios."""
                 'scope': 'https://api.ebay.com/oauth/api_scope'
             }
             
-            response = requests.post(oauth_url, headers=headers, data=data, timeout=10)
+            response = self.http.post(oauth_url, headers=headers, data=data, timeout=10)
             
-            self.results_text.insert(tk.END, f"eBay OAuth response: {response.status_code}\n")
-            self.root.update()
+            self._log(f"eBay OAuth response: {response.status_code}\n")
             
             if response.status_code != 200:
-                self.results_text.insert(tk.END, f"Response text: {response.text}\n")
-                self.root.update()
+                self._log(f"Response text: {response.text}\n")
             
             response.raise_for_status()
             
-            token_data = response.json()
-            self.results_text.insert(tk.END, f"Token response keys: {list(token_data.keys())}\n")
-            self.root.update()
+            token_data = _json_loads(response.content)
+            self._log(f"Token response keys: {list(token_data.keys())}\n")
             
             self.ebay_access_token = token_data.get('access_token')
             expires_in = token_data.get('expires_in', 7200)  # Default 2 hours
             
             if self.ebay_access_token:
-                # Set token expiry time (subtract 5 minutes for safety margin)
-                import datetime
-                self.ebay_token_expiry = datetime.datetime.now() + datetime.timedelta(seconds=expires_in - 300)
-                self.results_text.insert(tk.END, "eBay authentication successful!\n")
+                # Track expiry; _ensure_ebay_token refreshes it 60 seconds early
+                self.ebay_token_expiry = datetime.datetime.now() + datetime.timedelta(seconds=int(expires_in))
+                self._save_cached_ebay_token()
+                self._log("eBay authentication successful!\n")
                 return True
             else:
                 self.display_error("No access token in response")
@@ -1321,19 +2186,18 @@ Save multiple instruction sets for different vehicle types or scenarios."""
                 self.display_error(f"Response text: {e.response.text}")
             return False
     
-    def _encode_credentials(self) -> str:
-        import base64
+    def _set_ebay_basic_auth(self):
+        """Encode the client credentials for the OAuth Basic header (only when they change)"""
         credentials = f"{self.ebay_client_id}:{self.ebay_client_secret}"
-        return base64.b64encode(credentials.encode()).decode()
+        self._ebay_basic_auth = base64.b64encode(credentials.encode()).decode()
     
     def _analyze_prices_with_ai(self, raw_items: List[Dict], part_name: str, minimum_price: float = 0) -> Dict[str, float]:
         """Use AI to analyze pricing data instead of traditional statistical methods"""
         if not self.gemini_model or not self.use_ai_analysis:
             if not self.use_ai_analysis:
-                self.results_text.insert(tk.END, f"AI analysis disabled, using traditional analysis for {part_name}\n")
+                self._log(f"AI analysis disabled, using traditional analysis for {part_name}\n")
             else:
-                self.results_text.insert(tk.END, f"Gemini API not configured, falling back to traditional analysis for {part_name}\n")
-            self.root.update()
+                self._log(f"Gemini API not configured, falling back to traditional analysis for {part_name}\n")
             # Fall back to traditional method
             raw_prices = [item.get('total_price', item.get('price', 0)) for item in raw_items]
             raw_titles = [item.get('title', '') for item in raw_items]
@@ -1342,6 +2206,16 @@ Save multiple instruction sets for different vehicle types or scenarios."""
         if not raw_items:
             return {"low": 0, "average": 0, "high": 0, "items_analyzed": 0, "items_filtered_out": 0, "reasoning": "No data provided"}
         
+        if len(raw_items) < self.ai_min_items:
+            self._log(f"Only {len(raw_items)} items for {part_name}, using traditional analysis\n")
+            raw_prices = [item.get('total_price', item.get('price', 0)) for item in raw_items]
+            raw_titles = [item.get('title', '') for item in raw_items]
+            analysis = self._analyze_price_distribution(raw_prices, part_name, raw_titles, minimum_price)
+            # Too few listings to trust the tiers - make sure the part shows up in the warnings
+            analysis.update(confidence_rating='red', items_analyzed=len(raw_items), items_filtered_out=0,
+                            confidence_explanation=f"Insufficient sample ({len(raw_items)} listings)")
+            return analysis
+        
         try:
             # Format data for AI analysis
             csv_data = self.format_raw_results_for_ai(part_name, raw_items)
@@ -1349,88 +2223,214 @@ Save multiple instruction sets for different vehicle types or scenarios."""
             # For now, we'll extract it from the search results or pass None
             prompt = self.create_ai_analysis_prompt(part_name, csv_data, minimum_price, getattr(self, 'current_vehicle_info', None))
             
-            self.results_text.insert(tk.END, f"Analyzing {part_name} with AI ({len(raw_items)} items)...\n")
-            self.root.update()
+            # Identical prompt (same vehicle, listings and instructions) - reuse the earlier answer
+            cache_key = hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).digest()
+            cached = self._get_cached_ai_result(cache_key)
+            if cached is not None:
+                self._log(f"Using cached AI analysis for {part_name}\n")
+                return cached
             
-            # OPTIMIZATION 3: Improved Gemini API settings
-            max_retries = 2  # Reduced from 3 to 2
-            for attempt in range(max_retries):
-                try:
-                    response = self.gemini_model.generate_content(
-                        prompt,
-                        generation_config=genai.types.GenerationConfig(
-                            temperature=0.1,  # Low temperature for consistent analysis
-                            max_output_tokens=800,  # Reduced from 1000 to 800
-                            candidate_count=1  # Ensure single response
-                        )
-                    )
-                    break
-                except Exception as api_error:
-                    if attempt == max_retries - 1:
-                        raise api_error
-                    self.results_text.insert(tk.END, f"AI attempt {attempt + 1} failed, retrying...\n")
-                    self.root.update()
-                    import time
-                    time.sleep(0.5)  # Reduced delay from 1s to 0.5s
-            
-            # Parse JSON response
-            response_text = response.text.strip()
-            
-            # Clean up the response in case it has markdown formatting
-            if response_text.startswith('```json'):
-                response_text = response_text.replace('```json', '').replace('```', '').strip()
-            elif response_text.startswith('```'):
-                response_text = response_text.replace('```', '').strip()
-            
-            result = json.loads(response_text)
-            
-            # Validate the response structure
-            required_keys = ['low_price', 'average_price', 'high_price', 'items_analyzed', 'items_filtered_out', 'reasoning', 'confidence_rating', 'confidence_explanation']
-            if not all(key in result for key in required_keys):
-                raise ValueError(f"AI response missing required keys: {required_keys}")
-            
-            # Validate confidence rating
-            valid_confidence_levels = ['dark_green', 'light_green', 'yellow', 'orange', 'red']
-            confidence_rating = result.get('confidence_rating', '').lower()
-            if confidence_rating not in valid_confidence_levels:
-                self.results_text.insert(tk.END, f"Invalid confidence rating '{confidence_rating}', defaulting to 'yellow'\n")
-                confidence_rating = 'yellow'
-            
-            # Log AI reasoning for debugging
-            self.results_text.insert(tk.END, f"AI Analysis: {result['items_analyzed']} analyzed, {result['items_filtered_out']} filtered\n")
-            self.results_text.insert(tk.END, f"Confidence: {confidence_rating.upper()} - {result['confidence_explanation']}\n")
-            self.results_text.insert(tk.END, f"Full AI Reasoning for {part_name}:\n{result['reasoning']}\n")
-            self.results_text.insert(tk.END, "-"*50 + "\n")
-            self.root.update()
-            
-            return {
-                "low": float(result['low_price']),
-                "average": float(result['average_price']),
-                "high": float(result['high_price']),
-                "items_analyzed": result['items_analyzed'],
-                "items_filtered_out": result['items_filtered_out'],
-                "reasoning": result['reasoning'],
-                "confidence_rating": confidence_rating,
-                "confidence_explanation": result['confidence_explanation'],
-                "cleaned_count": result['items_analyzed'] - result['items_filtered_out'],
-                "items_removed": result['items_filtered_out']
-            }
+            self._log(f"Analyzing {part_name} with AI ({len(raw_items)} items)...\n")
+            
+            response_text = self._generate_ai_text(prompt, part_name)
+            
+            # JSON mode - the reply is the object itself, no code fences to strip
+            result = _json_loads(response_text)
+            analysis = self._parse_ai_analysis(result, part_name)
+            self._check_ai_tiers(analysis, raw_items, part_name, minimum_price)
+            self._store_cached_ai_result(cache_key, analysis)
+            return analysis
             
         except json.JSONDecodeError as e:
-            self.results_text.insert(tk.END, f"AI JSON parsing error for {part_name}: {str(e)}\n")
-            self.results_text.insert(tk.END, f"Raw AI response: {response.text[:200]}...\n")
-            self.root.update()
+            self._log(f"AI JSON parsing error for {part_name}: {str(e)}\n")
+            self._log(f"Raw AI response: {response_text[:200]}...\n")
         except Exception as e:
-            self.results_text.insert(tk.END, f"AI analysis error for {part_name}: {str(e)}\n")
-            self.root.update()
+            self._log(f"AI analysis error for {part_name}: {str(e)}\n")
         
         # Fall back to traditional method on error
-        self.results_text.insert(tk.END, f"Falling back to traditional analysis for {part_name}\n")
-        self.root.update()
+        self._log(f"Falling back to traditional analysis for {part_name}\n")
         raw_prices = [item.get('total_price', item.get('price', 0)) for item in raw_items]
         raw_titles = [item.get('title', '') for item in raw_items]
         return self._analyze_price_distribution(raw_prices, part_name, raw_titles, minimum_price)
     
+    def _generate_ai_text(self, prompt, label, max_output_tokens=800, response_schema=_AI_RESPONSE_SCHEMA):
+        """Send a prompt to Gemini with jittered retries and return the streamed reply text"""
+        # OPTIMIZATION 3: Improved Gemini API settings
+        max_retries = 3
+        backoff_base, backoff_cap = 0.5, 4.0
+        for attempt in range(max_retries):
+            try:
+                with self._ai_semaphore:
+                    # Stream the response so progress shows as soon as the first chunk arrives
+                    response = self.gemini_model.generate_content(
+                        prompt,
+                        generation_config=genai.types.GenerationConfig(
+                            temperature=0.1,  # Low temperature for consistent analysis
+                            max_output_tokens=max_output_tokens,  # 800 per part
+                            candidate_count=1,  # Ensure single response
+                            response_mime_type="application/json",
+                            response_schema=response_schema
+                        ),
+                        stream=True
+                    )
+                    chunks = []
+                    for chunk in response:
+                        if not chunks:
+                            self._log(f"AI responding for {label}...\n")
+                        chunks.append(chunk.text)
+                return "".join(chunks)
+            except Exception as api_error:
+                if attempt == max_retries - 1 or not self._is_retryable_ai_error(api_error):
+                    raise api_error
+                # Full jitter so concurrent part analyses don't retry in lockstep
+                delay = random.uniform(0, min(backoff_cap, backoff_base * (2 ** attempt)))
+                self._log(f"AI attempt {attempt + 1} failed, retrying in {delay:.1f}s...\n")
+                time.sleep(delay)
+    
+    def _parse_ai_analysis(self, result, part_name):
+        """Validate one part's AI JSON object and convert it to an analysis dict"""
+        # Validate the response structure
+        if not isinstance(result, dict) or not all(key in result for key in _AI_RESULT_KEYS):
+            raise ValueError(f"AI response missing required keys: {list(_AI_RESULT_KEYS)}")
+        
+        # Validate confidence rating
+        confidence_rating = str(result.get('confidence_rating', '')).lower()
+        if confidence_rating not in _AI_CONFIDENCE_LEVELS:
+            self._log(f"Invalid confidence rating '{confidence_rating}', defaulting to 'yellow'\n")
+            confidence_rating = 'yellow'
+        
+        # Log AI reasoning for debugging
+        self._log(f"AI Analysis: {result['items_analyzed']} analyzed, {result['items_filtered_out']} filtered\n")
+        self._log(f"Confidence: {confidence_rating.upper()} - {result['confidence_explanation']}\n")
+        self._log(f"Full AI Reasoning for {part_name}:\n{result['reasoning']}\n")
+        self._log("-"*50 + "\n")
+        
+        return {
+            "low": float(result['low_price']),
+            "average": float(result['average_price']),
+            "high": float(result['high_price']),
+            "items_analyzed": result['items_analyzed'],
+            "items_filtered_out": result['items_filtered_out'],
+            "reasoning": result['reasoning'],
+            "confidence_rating": confidence_rating,
+            "confidence_explanation": result['confidence_explanation'],
+            "cleaned_count": result['items_analyzed'] - result['items_filtered_out'],
+            "items_removed": result['items_filtered_out']
+        }
+    
+    def _local_tier_estimate(self, raw_items, minimum_price=0):
+        """Quick (low, average, high) from the 15th/32nd/52nd percentiles of listing totals"""
+        totals = sorted(
+            total for total in (item.get('total_price', item.get('price', 0) + item.get('shipping', 0))
+                                for item in raw_items)
+            if total >= minimum_price
+        )
+        if not totals:
+            return 0.0, 0.0, 0.0
+        return _percentile(totals, 15), _percentile(totals, 32), _percentile(totals, 52)
+    
+    def _check_ai_tiers(self, analysis, raw_items, part_name, minimum_price=0):
+        """Downgrade confidence when the AI's average is far from the listings' own percentiles"""
+        local_average = self._local_tier_estimate(raw_items, minimum_price)[1]
+        if local_average <= 0:
+            return
+        if not local_average / 3 <= analysis['average'] <= local_average * 3:
+            self._log(f"AI average ${analysis['average']:.2f} for {part_name} is far from the "
+                      f"listings' ${local_average:.2f} - flagging as low confidence\n")
+            if analysis['confidence_rating'] not in LOW_CONF_SET:
+                analysis['confidence_rating'] = 'orange'
+    
+    def _analyze_parts_batch(self, parts_prices):
+        """Price every searched part with a single Gemini call, falling back per part on failure"""
+        # Parts whose search deferred the analysis, with their raw items and minimum price
+        pending = [(part['search_query'], self.raw_search_results.get(part['search_query'], []),
+                    part.get('min_price', 0))
+                   for part in self.parts_list
+                   if parts_prices.get(part['search_query'], {}).pop('needs_analysis', False)]
+        if not pending:
+            return
+        
+        # Only parts with enough listings are worth sending - the rest take the single-part path
+        batch = [entry for entry in pending if len(entry[1]) >= self.ai_min_items]
+        analyses = {}
+        if self.gemini_model and self.use_ai_analysis and len(batch) > 1:
+            response_text = ""
+            try:
+                payload = [(name, self.format_raw_results_for_ai(name, items), min_price)
+                           for name, items, min_price in batch]
+                prompt = self.create_batch_ai_analysis_prompt(payload, getattr(self, 'current_vehicle_info', None))
+                
+                cache_key = hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).digest()
+                cached = self._get_cached_ai_result(cache_key)
+                if cached is not None:
+                    self._log(f"Using cached AI analysis for {len(batch)} parts\n")
+                    analyses = cached
+                else:
+                    self._log(f"Analyzing {len(batch)} parts with one AI call...\n")
+                    response_text = self._generate_ai_text(prompt, f"{len(batch)} parts",
+                                                           max_output_tokens=min(8192, 800 * len(batch)),
+                                                           response_schema=_AI_BATCH_RESPONSE_SCHEMA)
+                    results = {entry.get('part_name'): entry
+                               for entry in _json_loads(response_text).get('results', [])}
+                    for name, items, min_price in batch:
+                        try:
+                            analyses[name] = self._parse_ai_analysis(results.get(name), name)
+                            self._check_ai_tiers(analyses[name], items, name, min_price)
+                        except Exception as e:
+                            self._log(f"Batch AI result unusable for {name}: {str(e)}\n")
+                    if len(analyses) == len(batch):
+                        self._store_cached_ai_result(cache_key, analyses)
+            except json.JSONDecodeError as e:
+                self._log(f"Batch AI JSON parsing error: {str(e)}\n")
+                self._log(f"Raw AI response: {response_text[:200]}...\n")
+            except Exception as e:
+                self._log(f"Batch AI analysis error: {str(e)}\n")
+        
+        # Single-part prompt (or traditional analysis) for anything the batch didn't cover. These
+        # run side by side (still capped by _ai_semaphore) so the wait is the slowest part, not the sum.
+        leftovers = [(items, name, min_price) for name, items, min_price in pending if name not in analyses]
+        if leftovers:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(leftovers), 8)) as executor:
+                for (_, name, _), analysis in zip(leftovers, executor.map(
+                        lambda entry: self._analyze_prices_with_ai(*entry), leftovers)):
+                    analyses[name] = analysis
+        
+        for name, _, _ in pending:
+            part_result = self._build_part_result(analyses[name])
+            part_result['duplicates_removed'] = parts_prices[name].get('duplicates_removed', 0)
+            parts_prices[name] = part_result
+    
+    def _get_cached_ai_result(self, key):
+        """Return a copy of a cached AI result younger than an hour, or None"""
+        with self._ai_cache_lock:
+            cached = self._ai_cache.get(key)
+            if cached is None:
+                return None
+            stored_at, result = cached
+            if time.time() - stored_at >= 3600:
+                del self._ai_cache[key]
+                return None
+            self._ai_cache.move_to_end(key)
+            return dict(result)
+    
+    def _store_cached_ai_result(self, key, result):
+        """Cache a successful AI result, evicting the least recently used beyond 256"""
+        with self._ai_cache_lock:
+            self._ai_cache[key] = (time.time(), dict(result))
+            self._ai_cache.move_to_end(key)
+            while len(self._ai_cache) > 256:
+                self._ai_cache.popitem(last=False)
+    
+    def _is_retryable_ai_error(self, error) -> bool:
+        """Whether a Gemini call failure is transient (rate limit, server error, timeout)"""
+        code = getattr(error, 'code', None)
+        if not isinstance(code, int):
+            code = getattr(error, 'status_code', None)
+        if isinstance(code, int):
+            return code in (408, 429) or code >= 500
+        # Blocked/empty responses and bad arguments won't change on retry
+        return not isinstance(error, (ValueError, TypeError))
+    
     def _analyze_price_distribution(self, raw_prices: List[float], part_name: str, raw_titles: List[str] = None, minimum_price: float = 0) -> Dict[str, float]:
         """
         Junkyard Parts Pricing Analysis System
@@ -1448,23 +2448,13 @@ Save multiple instruction sets for different vehicle types or scenarios."""
         removed_items = []
         
         # Step 1: Remove miscategorized items based on suspicious keywords
-        suspicious_keywords = {
-            'engine': ['oil filter', 'housing', 'gasket', 'seal', 'sensor', 'valve cover', 'dipstick', 'bracket', 'mount', 'belt', 'pulley'],
-            'alternator': ['brush', 'pulley', 'wire', 'connector', 'regulator', 'belt'],
-            'transmission': ['fluid', 'filter', 'gasket', 'cooler', 'mount', 'line'],
-            'starter': ['solenoid', 'brush', 'drive', 'gear', 'bolt'],
-            'brake caliper': ['pad', 'rotor', 'disc', 'fluid', 'line', 'hose'],
-            'fuel pump': ['filter', 'line', 'hose', 'tank', 'sending unit'],
-            'headlight': ['bulb', 'ballast', 'wire', 'connector', 'lens', 'cover']
-        }
-        
-        keywords_to_check = suspicious_keywords.get(part_name.lower(), [])
+        keyword_re = _SUSPICIOUS_KEYWORD_RES.get(part_name.lower())
         
         for i, price in enumerate(raw_prices):
-            title = raw_titles[i].lower() if raw_titles and i < len(raw_titles) else ""
+            title = raw_titles[i] if raw_titles and i < len(raw_titles) else ""
             
-            # Check for suspicious keywords
-            is_suspicious = any(keyword in title for keyword in keywords_to_check)
+            # Check for suspicious keywords (one case-insensitive scan per title)
+            is_suspicious = keyword_re is not None and keyword_re.search(title) is not None
             
             if is_suspicious:
                 removed_items.append(f"${price:.2f} - Miscategorized (contains suspicious keywords)")
@@ -1484,8 +2474,9 @@ Save multiple instruction sets for different vehicle types or scenarios."""
             cleaned_prices = further_cleaned
         
         # Step 3: Optional IQR outlier detection (for extreme outliers only)
-        if len(cleaned_prices) >= 10:
-            sorted_prices = sorted(cleaned_prices)
+        # Sort once here - the percentile tiers below reuse the same sorted list
+        sorted_prices = sorted(cleaned_prices)
+        if len(sorted_prices) >= 10:
             q1_idx = len(sorted_prices) // 4
             q3_idx = 3 * len(sorted_prices) // 4
             q1 = sorted_prices[q1_idx]
@@ -1503,65 +2494,38 @@ Save multiple instruction sets for different vehicle types or scenarios."""
                 iqr_cleaned.append(price)
             
             cleaned_prices = iqr_cleaned
+            # Bounds filtering keeps the order, so no need to sort again
+            sorted_prices = [price for price in sorted_prices if lower_bound <= price <= upper_bound]
         
         if not cleaned_prices:
             return {"low": 0, "average": 0, "high": 0, "items_removed": original_count, "cleaned_count": 0}
         
         # Calculate percentile-based pricing tiers
-        sorted_prices = sorted(cleaned_prices)
         n = len(sorted_prices)
         
-        # Calculate percentiles using proper interpolation
-        def get_percentile(data, percentile):
-            if len(data) == 1:
-                return data[0]
-            index = (percentile / 100.0) * (len(data) - 1)
-            lower_index = int(index)
-            upper_index = min(lower_index + 1, len(data) - 1)
-            weight = index - lower_index
-            return data[lower_index] * (1 - weight) + data[upper_index] * weight
-        
-        raw_p10 = get_percentile(sorted_prices, 10)
-        raw_p30 = get_percentile(sorted_prices, 30)  
-        raw_p50 = get_percentile(sorted_prices, 50)
-        
-        # Smart rounding based on price range
-        def smart_round(price):
-            if price < 100:
-                return round(price / 5) * 5  # Round to nearest $5
-            elif price < 500:
-                return round(price / 10) * 10  # Round to nearest $10
-            else:
-                return round(price / 25) * 25  # Round to nearest $25
-        
-        budget_tier = smart_round(raw_p10)
-        standard_tier = smart_round(raw_p30)
-        premium_tier = smart_round(raw_p50)
-        
         # Handle categories with very few results differently
-        if n < 10:
+        if n >= 10:
+            raw_p10 = _percentile(sorted_prices, 10)
+            raw_p30 = _percentile(sorted_prices, 30)  
+            raw_p50 = _percentile(sorted_prices, 50)
+            
+            budget_tier = _smart_round(raw_p10)
+            standard_tier = _smart_round(raw_p30)
+            premium_tier = _smart_round(raw_p50)
+        else:
             # For small datasets, use even more aggressive percentiles
-            raw_p10 = get_percentile(sorted_prices, 5)   # Very low percentile
-            raw_p30 = get_percentile(sorted_prices, 25)
-            raw_p50 = get_percentile(sorted_prices, 50)
-            
-            # Use smaller rounding increments
-            def small_round(price):
-                if price < 50:
-                    return round(price)  # Round to nearest $1
-                elif price < 200:
-                    return round(price / 5) * 5  # Round to nearest $5
-                else:
-                    return round(price / 10) * 10  # Round to nearest $10
+            raw_p10 = _percentile(sorted_prices, 5)   # Very low percentile
+            raw_p30 = _percentile(sorted_prices, 25)
+            raw_p50 = _percentile(sorted_prices, 50)
             
-            budget_tier = small_round(raw_p10)
-            standard_tier = small_round(raw_p30)
-            premium_tier = small_round(raw_p50)
+            budget_tier = _small_round(raw_p10)
+            standard_tier = _small_round(raw_p30)
+            premium_tier = _small_round(raw_p50)
         
         # Ensure tiers are different - if they're the same after rounding, adjust
         if budget_tier == standard_tier == premium_tier and n >= 3:
             # Force some separation
-            price_range = max(sorted_prices) - min(sorted_prices)
+            price_range = sorted_prices[-1] - sorted_prices[0]
             if price_range > 10:  # Only if there's meaningful range
                 if price_range < 50:
                     step = 5
@@ -1570,7 +2534,7 @@ Save multiple instruction sets for different vehicle types or scenarios."""
                 else:
                     step = 25
                 
-                budget_tier = max(budget_tier - step, min(sorted_prices))
+                budget_tier = max(budget_tier - step, sorted_prices[0])
                 premium_tier = premium_tier + step
         
         return {
@@ -1583,19 +2547,23 @@ Save multiple instruction sets for different vehicle types or scenarios."""
             "items_removed": original_count - len(cleaned_prices),
             "cleaned_count": len(cleaned_prices),
             "removed_details": removed_items[:3],  # First 3 removed items for debugging
-            "final_range": max(cleaned_prices) - min(cleaned_prices) if cleaned_prices else 0,
+            "final_range": sorted_prices[-1] - sorted_prices[0],
             "minimum_price": minimum_price
         }
     
     def search_ebay_parts(self, vehicle_info: Dict) -> Dict[str, float]:
-        self.results_text.insert(tk.END, "Starting eBay parts search...\n")
-        self.root.update()
+        self._log("Starting eBay parts search...\n")
         
-        if not self.ebay_access_token and not self.get_ebay_access_token():
-            self.results_text.insert(tk.END, "Failed to get eBay token, aborting search\n")
-            self.root.update()
+        if not self._ensure_ebay_token():
+            self._log("Failed to get eBay token, aborting search\n")
             return {}
         
+        # Pick up edits to parts_list.csv without a restart (no-op if unchanged)
+        self.load_parts_list()
+        
+        # Create the part tabs up front so they keep the parts list order as results arrive
+        self.ui_queue.put(('part_tabs', [part['search_query'] for part in self.parts_list]))
+        
         parts_prices = {}
         
         # eBay Browse API endpoint
@@ -1604,21 +2572,28 @@ Save multiple instruction sets for different vehicle types or scenarios."""
         else:
             search_url = "https://api.sandbox.ebay.com/buy/browse/v1/item_summary/search"
         
-        headers = {
-            'Authorization': f'Bearer {self.ebay_access_token}',
-            'Content-Type': 'application/json'
-        }
+        # Single targeted search: full year only for speed. The year/make/model prefix is the
+        # same for every part, so build it once here.
+        model = vehicle_info['model']
+        model = _MODEL_REWRITES.get((vehicle_info['make'].upper(), model.upper()), model)
+        vehicle_prefix = f"{vehicle_info['year']} {vehicle_info['make']} {model}"
+        
+        # Searches run off the UI thread now, so concurrent processing is safe to use by default.
+        # EBAY_SEARCH_CONCURRENCY caps the number of in-flight eBay requests to stay under throttling.
+        use_concurrent = os.getenv('USE_CONCURRENT_SEARCH', 'true').lower() == 'true'
+        max_concurrent = max(1, int(os.getenv('EBAY_SEARCH_CONCURRENCY', '10')))
         
-        # DISABLED: Concurrent processing causing freezes, using sequential by default
-        use_concurrent = os.getenv('USE_CONCURRENT_SEARCH', 'false').lower() == 'true'
+        # AI_BATCH_ANALYSIS prices every part in one Gemini call once all searches are in,
+        # instead of one call per part as each search finishes
+        analyze_each = not (self.gemini_model and self.use_ai_analysis
+                            and os.getenv('AI_BATCH_ANALYSIS', 'true').lower() == 'true')
         
         if use_concurrent:
             try:
-                import concurrent.futures
-                
                 def search_single_part_safe(part):
                     try:
-                        return self._search_single_part_optimized(part, vehicle_info, search_url, headers)
+                        return self._search_single_part_optimized(part, vehicle_info, search_url, vehicle_prefix,
+                                                                  analyze_each)
                     except Exception as e:
                         # Return error result instead of raising
                         return part['search_query'], {
@@ -1626,13 +2601,13 @@ Save multiple instruction sets for different vehicle types or scenarios."""
                             'error': str(e), 'raw_items': []
                         }
                 
-                # Execute searches concurrently (reduced to 3 threads for stability)
-                self.results_text.insert(tk.END, f"Searching {len(self.parts_list)} parts (3 concurrent)...\n")
-                self.root.update()
+                # Execute searches concurrently, bounded by the concurrency cap
+                workers = min(max_concurrent, len(self.parts_list)) or 1
+                self._log(f"Searching {len(self.parts_list)} parts ({workers} concurrent)...\n")
                 
                 completed_count = 0
                 
-                with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
                     # Submit all jobs
                     future_to_part = {executor.submit(search_single_part_safe, part): part for part in self.parts_list}
                     
@@ -1642,72 +2617,96 @@ Save multiple instruction sets for different vehicle types or scenarios."""
                         try:
                             part_name, part_result = future.result(timeout=45)  # 45 second timeout per part
                             parts_prices[part_name] = part_result
+                            self._publish_part_results(part_name, part_result)
                             completed_count += 1
                             
                             # Check for errors in result
                             if 'error' in part_result:
-                                self.results_text.insert(tk.END, f"✗ {part_name} failed: {part_result['error']}\n")
+                                self._log(f"✗ {part_name} failed: {part_result['error']}\n")
                             else:
-                                self.results_text.insert(tk.END, f"✓ {part_name} completed ({completed_count}/{len(self.parts_list)})\n")
-                            self.root.update()
+                                self._log(f"✓ {part_name} completed ({completed_count}/{len(self.parts_list)})\n")
                             
                         except concurrent.futures.TimeoutError:
-                            self.results_text.insert(tk.END, f"✗ {part['search_query']} timed out\n")
-                            parts_prices[part['search_query']] = {'low': 0.0, 'average': 0.0, 'high': 0.0, 'raw_items': []}
-                            self.root.update()
+                            self._log(f"✗ {part['search_query']} timed out\n")
+                            parts_prices[part['search_query']] = {'low': 0.0, 'average': 0.0, 'high': 0.0}
+                            self._publish_part_results(part['search_query'], {'raw_items': []})
                         except Exception as exc:
-                            self.results_text.insert(tk.END, f"✗ {part['search_query']} failed: {str(exc)}\n")
-                            parts_prices[part['search_query']] = {'low': 0.0, 'average': 0.0, 'high': 0.0, 'raw_items': []}
-                            self.root.update()
+                            self._log(f"✗ {part['search_query']} failed: {str(exc)}\n")
+                            parts_prices[part['search_query']] = {'low': 0.0, 'average': 0.0, 'high': 0.0}
+                            self._publish_part_results(part['search_query'], {'raw_items': []})
+                
+                # Results arrive in completion order - restore the parts list order for display
+                parts_prices = {part['search_query']: parts_prices[part['search_query']]
+                                for part in self.parts_list if part['search_query'] in parts_prices}
                             
             except Exception as concurrent_error:
-                self.results_text.insert(tk.END, f"Concurrent processing failed, switching to sequential: {str(concurrent_error)}\n")
+                self._log(f"Concurrent processing failed, switching to sequential: {str(concurrent_error)}\n")
                 use_concurrent = False
         
-        # Sequential processing (default and safer)
+        # Sequential processing (fallback, or when USE_CONCURRENT_SEARCH=false)
         if not use_concurrent:
-            self.results_text.insert(tk.END, f"Searching {len(self.parts_list)} parts sequentially (optimized)...\n")
-            self.root.update()
+            self._log(f"Searching {len(self.parts_list)} parts sequentially (optimized)...\n")
             
             for i, part in enumerate(self.parts_list):
+                if self._closing.is_set():
+                    break
                 try:
-                    self.results_text.insert(tk.END, f"Searching {part['search_query']} ({i+1}/{len(self.parts_list)})...\n")
-                    self.root.update()
+                    self._log(f"Searching {part['search_query']} ({i+1}/{len(self.parts_list)})...\n")
                     
                     # Call the optimized search function
-                    part_name, part_result = self._search_single_part_optimized(part, vehicle_info, search_url, headers)
+                    part_name, part_result = self._search_single_part_optimized(part, vehicle_info, search_url,
+                                                                                vehicle_prefix, analyze_each)
                     parts_prices[part_name] = part_result
+                    self._publish_part_results(part_name, part_result)
                     
                     # Show completion with confidence if available
                     confidence = part_result.get('confidence_rating', '')
                     confidence_text = f" ({confidence.upper()})" if confidence else ""
-                    self.results_text.insert(tk.END, f"✓ {part_name} completed{confidence_text}\n")
-                    self.root.update()
+                    self._log(f"✓ {part_name} completed{confidence_text}\n")
                     
                 except Exception as e:
-                    self.results_text.insert(tk.END, f"✗ {part['search_query']} failed: {str(e)[:100]}\n")
-                    parts_prices[part['search_query']] = {'low': 0.0, 'average': 0.0, 'high': 0.0, 'raw_items': []}
-                    self.root.update()
+                    self._log(f"✗ {part['search_query']} failed: {str(e)[:100]}\n")
+                    parts_prices[part['search_query']] = {'low': 0.0, 'average': 0.0, 'high': 0.0}
+                    self._publish_part_results(part['search_query'], {'raw_items': []})
         
-        # After all searches complete, update the part tables
-        self.results_text.insert(tk.END, "Updating search result tables...\n")
-        self.root.update()
-        
-        for part_name, part_data in parts_prices.items():
-            if isinstance(part_data, dict) and 'raw_items' in part_data:
-                # Extract raw_items from the result and store in raw_search_results
-                raw_items = part_data.pop('raw_items')  # Remove from parts_prices
-                self.raw_search_results[part_name] = raw_items
-                self.update_part_table(part_name, raw_items)
+        if not analyze_each and not self._closing.is_set():
+            self._analyze_parts_batch(parts_prices)
         
         return parts_prices
     
-    def _search_single_part_optimized(self, part, vehicle_info, search_url, headers):
-        """Optimized single part search with better error handling and timeout"""
+    def _build_part_result(self, price_analysis):
+        """Store all price points and AI analysis metadata for one part"""
+        return {
+            'low': price_analysis["low"],
+            'average': price_analysis["average"], 
+            'high': price_analysis["high"],
+            'reasoning': price_analysis.get("reasoning", ""),
+            'items_analyzed': price_analysis.get("items_analyzed", 0),
+            'items_filtered_out': price_analysis.get("items_filtered_out", 0),
+            'cleaned_count': price_analysis.get("cleaned_count", 0),
+            'confidence_rating': price_analysis.get("confidence_rating", "yellow"),
+            'confidence_explanation': price_analysis.get("confidence_explanation", "No confidence data available")
+        }
+    
+    def _publish_part_results(self, part_name, part_result):
+        """Move a part's raw_items into raw_search_results and show its table as soon as it's done"""
+        if isinstance(part_result, dict) and 'raw_items' in part_result:
+            raw_items = part_result.pop('raw_items')  # Remove from parts_prices
+            self.raw_search_results[part_name] = raw_items
+            # Sorting and formatting happen here so the UI thread only inserts rows
+            self.ui_queue.put(('part_table', (part_name, self._format_part_rows(raw_items))))
+    
+    def _search_single_part_optimized(self, part, vehicle_info, search_url, vehicle_prefix, analyze=True):
+        """Optimized single part search with better error handling and timeout
+        
+        With analyze=False the pricing is left to _analyze_parts_batch and the result is
+        flagged 'needs_analysis'.
+        """
+        if self._closing.is_set():
+            # Window closed - parts still queued in the search pool are skipped
+            return part['search_query'], {'low': 0.0, 'average': 0.0, 'high': 0.0,
+                                          'error': 'cancelled', 'raw_items': []}
         try:
-            # Single targeted search: full year only for speed
-            year = vehicle_info['year']
-            
             # Include engine size for engine searches to improve specificity
             engine_size = ""
             if part['search_query'].lower() == 'engine' and vehicle_info.get('engine_displacement'):
@@ -1717,16 +2716,7 @@ Save multiple instruction sets for different vehicle types or scenarios."""
                 except (ValueError, TypeError):
                     engine_size = f" {vehicle_info['engine_displacement']}"
             
-            # Handle Chrysler 300C and 300S by dropping the suffix letter
-            model = vehicle_info['model']
-            if vehicle_info['make'].upper() == 'CHRYSLER' and model.upper() in ['300C', '300S']:
-                model = '300'
-            
-            search_query = f"{year} {vehicle_info['make']} {model}{engine_size} {part['search_query']}"
-            
-            # Match your manual search - just Used condition (3000)
-            condition_filter = "conditionIds:{3000}"  # Used only
-            buying_filter = "buyingOptions:{FIXED_PRICE}"
+            search_query = f"{vehicle_prefix}{engine_size} {part['search_query']}"
             
             # Add price filter if minimum price is specified for this part
             price_filter = ""
@@ -1735,7 +2725,7 @@ Save multiple instruction sets for different vehicle types or scenarios."""
                 price_filter = f"price:[{min_price}..],priceCurrency:USD"
             
             # Build filter string - combine all filters
-            filters = [condition_filter, buying_filter]
+            filters = list(_STATIC_SEARCH_FILTERS)
             if price_filter:
                 filters.append(price_filter)
             
@@ -1744,73 +2734,95 @@ Save multiple instruction sets for different vehicle types or scenarios."""
                 'category_ids': part['category_id'],
                 'filter': ','.join(filters),
                 'sort': 'price',
-                'limit': '200'  # Keep 200 items as requested
+                'limit': '200',  # Keep 200 items as requested
+                # Item summaries only - no refinement histograms in the response
+                'fieldgroups': 'MATCHING_ITEMS'
             }
             
-            # OPTIMIZATION 2: Reduced timeout and better connection settings
-            response = requests.get(search_url, headers=headers, params=params, 
-                                  timeout=8, stream=False)  # Reduced from 10s to 8s
-            
-            if response.status_code != 200:
-                return part['search_query'], {'low': 0.0, 'average': 0.0, 'high': 0.0}
+            # Serve repeat searches from the on-disk cache before touching the network
+            cache_key = self._search_cache_key(search_url, params)
+            data = self._get_cached_search(cache_key)
+            if data is not None:
+                self._log(f"Using cached eBay results for {part['search_query']}\n")
+            else:
+                # OPTIMIZATION 2: Reduced timeout and better connection settings
+                # (read the token per request so a refresh by another part's thread is picked up)
+                token = self.ebay_access_token
+                response = self.http.get(search_url, headers={'Authorization': f'Bearer {token}'},
+                                         params=params, timeout=8, stream=False)  # Reduced from 10s to 8s
+                
+                # Token expired or was revoked - refresh it and retry once
+                if response.status_code == 401:
+                    if self._refresh_ebay_token(token):
+                        response = self.http.get(search_url,
+                                                 headers={'Authorization': f'Bearer {self.ebay_access_token}'},
+                                                 params=params, timeout=8)
+                
+                if response.status_code != 200:
+                    return part['search_query'], {'low': 0.0, 'average': 0.0, 'high': 0.0}
+                
+                data = _json_loads(response.content)
+                self._store_cached_search(cache_key, response.content)
             
-            data = response.json()
             items = data.get('itemSummaries', [])
             
-            prices = []
-            titles = []
-            raw_items = []  # Store raw items for table display
+            # One compact record per listing - the analysis, AI prompt and table all read from these
+            raw_items = []
+            # Same total + same title start is a seller relisting the same part - keep it once
+            seen = set()
+            duplicates = 0
             
-            if items:
-                for item in items:
-                    if 'price' in item and 'value' in item['price']:
-                        try:
-                            price = float(item['price']['value'])
-                            
-                            # Add shipping cost if present
-                            shipping_cost = 0.0
-                            if 'shippingOptions' in item and item['shippingOptions']:
-                                shipping_option = item['shippingOptions'][0]  # Take first shipping option
-                                if 'shippingCost' in shipping_option and 'value' in shipping_option['shippingCost']:
-                                    shipping_cost = float(shipping_option['shippingCost']['value'])
-                            
-                            total_price = price + shipping_cost
-                            
-                            # No price filtering - accept all valid prices
-                            prices.append(total_price)
-                            titles.append(item.get('title', ''))
-                            
-                            # Store raw item data for table display
-                            raw_items.append({
-                                'price': price,
-                                'shipping': shipping_cost,
-                                'total_price': total_price,
-                                'title': item.get('title', 'No title'),
-                                'item_id': item.get('itemId', ''),
-                                'condition': item.get('condition', ''),
-                                'location': item.get('itemLocation', {}).get('country', '')
-                            })
-                                
-                        except (ValueError, TypeError):
-                            continue
+            append = raw_items.append
+            for item in items:
+                price_value = item.get('price', {}).get('value')
+                if price_value is None:
+                    continue
+                try:
+                    price = float(price_value)
+                    
+                    # Add shipping cost if present (first shipping option)
+                    shipping_options = item.get('shippingOptions')
+                    shipping_value = shipping_options[0].get('shippingCost', {}).get('value') if shipping_options else None
+                    shipping_cost = float(shipping_value) if shipping_value is not None else 0.0
+                    
+                    title = item.get('title', 'No title')
+                    total_price = price + shipping_cost
+                    listing_key = (round(total_price, 2), title[:40].lower().strip())
+                    if listing_key in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(listing_key)
+                    
+                    # No price filtering - accept all valid prices
+                    append({
+                        'price': price,
+                        'shipping': shipping_cost,
+                        'total_price': total_price,
+                        'title': title,
+                        'item_id': item.get('itemId', '')
+                    })
+                    
+                except (ValueError, TypeError):
+                    continue
+            
+            if duplicates:
+                self._log(f"Skipped {duplicates} duplicate listings for {part['search_query']}\n")
+            
+            if raw_items and not analyze:
+                return part['search_query'], {
+                    'low': 0.0, 'average': 0.0, 'high': 0.0,
+                    'needs_analysis': True,
+                    'duplicates_removed': duplicates,
+                    'raw_items': raw_items
+                }
             
-            if prices:
+            if raw_items:
                 # AI-Powered Junkyard Parts Pricing Analysis System
                 price_analysis = self._analyze_prices_with_ai(raw_items, part['search_query'], part.get('min_price', 0))
                 
-                # Store all price points and AI analysis metadata
-                part_result = {
-                    'low': price_analysis["low"],
-                    'average': price_analysis["average"], 
-                    'high': price_analysis["high"],
-                    'reasoning': price_analysis.get("reasoning", ""),
-                    'items_analyzed': price_analysis.get("items_analyzed", 0),
-                    'items_filtered_out': price_analysis.get("items_filtered_out", 0),
-                    'cleaned_count': price_analysis.get("cleaned_count", 0),
-                    'confidence_rating': price_analysis.get("confidence_rating", "yellow"),
-                    'confidence_explanation': price_analysis.get("confidence_explanation", "No confidence data available"),
-                    'raw_items': raw_items  # Store raw items in result for main thread processing
-                }
+                part_result = self._build_part_result(price_analysis)
+                part_result['duplicates_removed'] = duplicates
+                part_result['raw_items'] = raw_items  # Store raw items in result for main thread processing
                 
                 return part['search_query'], part_result
             else:
@@ -1824,63 +2836,99 @@ Save multiple instruction sets for different vehicle types or scenarios."""
             return part['search_query'], {'low': 0.0, 'average': 0.0, 'high': 0.0}
     
     def calculate_recommended_bid(self, parts_prices: Dict[str, dict]) -> Dict[str, float]:
-        # Calculate totals for low, average, and high scenarios
-        totals = {'low': 0, 'average': 0, 'high': 0}
-        
+        # Calculate totals for low, average, and high scenarios (single pass, local sums)
+        low = average = high = 0
         for part_prices in parts_prices.values():
             if isinstance(part_prices, dict):
-                totals['low'] += part_prices.get('low', 0)
-                totals['average'] += part_prices.get('average', 0)
-                totals['high'] += part_prices.get('high', 0)
+                low += part_prices.get('low', 0)
+                average += part_prices.get('average', 0)
+                high += part_prices.get('high', 0)
             else:
                 # Fallback for old format
-                totals['low'] += part_prices
-                totals['average'] += part_prices
-                totals['high'] += part_prices
-        
-        # Calculate bids using new formula:
-        # if Parts_Value <= 3000: Bid = 300
-        # else: Excess = Parts_Value - 3000; Percentage = 0.25 + 0.40 × sqrt((Parts_Value - 3000) / 15000); Bid = 300 + Excess × Percentage
-        import math
-        
-        def calculate_bid(parts_value):
-            if parts_value <= 0:
-                return 0
-            elif parts_value <= 3000:
-                return 300
-            else:
-                excess = parts_value - 3000
-                percentage = 0.25 + 0.40 * math.sqrt((parts_value - 3000) / 15000)
-                return 300 + excess * percentage
+                low += part_prices
+                average += part_prices
+                high += part_prices
         
+        totals = {'low': low, 'average': average, 'high': high}
         bids = {
-            'low': calculate_bid(totals['low']),
-            'average': calculate_bid(totals['average']),
-            'high': calculate_bid(totals['high'])
+            'low': _bid_for_parts_value(low),
+            'average': _bid_for_parts_value(average),
+            'high': _bid_for_parts_value(high)
         }
         
         return {'totals': totals, 'bids': bids}
     
     def format_raw_results_for_ai(self, part_name: str, raw_items: List[Dict]) -> str:
         """Format raw search results into CSV format for AI analysis"""
-        csv_lines = []
-        csv_lines.append("Price,Shipping,Total,Title")
-        
-        for item in raw_items:
-            price = item.get('price', 0)
-            shipping = item.get('shipping', 0)
-            total_price = item.get('total_price', price + shipping)
-            title = item.get('title', '').replace(',', ';').replace('\n', ' ').strip()
-            
-            csv_lines.append(f"{price:.2f},{shipping:.2f},{total_price:.2f},\"{title}\"")
-        
-        return "\n".join(csv_lines)
+        # Big result sets are trimmed to a representative sample to bound the prompt size
+        raw_items = _sample_items_for_ai(raw_items)
+        
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator='\n')
+        writer.writerow(("Price", "Shipping", "Total", "Title"))
+        
+        # csv handles commas and quotes in titles; line breaks are still flattened to keep one row per line
+        writer.writerows(
+            ("%.2f" % price, "%.2f" % shipping,
+             "%.2f" % item.get('total_price', price + shipping),
+             item.get('title', '').translate(_TITLE_FLATTEN).strip())
+            for item in raw_items
+            for price, shipping in ((item.get('price', 0), item.get('shipping', 0)),)
+        )
+        
+        return buf.getvalue()
     
     def create_ai_analysis_prompt(self, part_name: str, csv_data: str, min_price: float = 0, vehicle_info: dict = None) -> str:
         """Create comprehensive prompt for AI analysis of eBay pricing data"""
-        # Get custom user instructions
-        custom_instructions = self.get_custom_ai_instructions()
+        context = self._get_prompt_context(vehicle_info)
         
+        # OPTIMIZATION 4: Streamlined AI prompt for faster processing
+        return f"""Analyze eBay "{part_name}" prices for junkyard business.{context}
+
+**DATA:** CSV with Price,Shipping,Total,Title columns:
+{csv_data}
+
+{_PROMPT_FILTER_RULES}
+{"5. Items under $" + str(min_price) if min_price > 0 else ""}
+{_PROMPT_STATIC_TAIL}"""
+    
+    def create_batch_ai_analysis_prompt(self, parts_payload, vehicle_info: dict = None) -> str:
+        """Create one prompt covering several parts - parts_payload is [(part_name, csv_data, min_price)]"""
+        context = self._get_prompt_context(vehicle_info)
+        
+        # The vehicle context and rules are sent once and shared by every part's CSV block
+        sections = []
+        for part_name, csv_data, min_price in parts_payload:
+            min_note = f" (exclude items under ${min_price})" if min_price > 0 else ""
+            sections.append(f'### PART: "{part_name}"{min_note}\n{csv_data}')
+        parts_data = "\n\n".join(sections)
+        
+        return f"""Analyze eBay prices for {len(parts_payload)} parts for junkyard business. Judge each part separately.{context}
+
+**DATA:** One CSV block per part with Price,Shipping,Total,Title columns:
+{parts_data}
+
+{_PROMPT_FILTER_RULES}
+5. Items under the minimum price noted in a part's header
+{_PROMPT_BATCH_TAIL}"""
+    
+    def _get_prompt_context(self, vehicle_info):
+        """Return the cached vehicle context + custom instructions section for a prompt"""
+        # Get custom user instructions (captured on the UI thread when the scan started)
+        custom_instructions = getattr(self, 'current_custom_instructions', '')
+        
+        # Vehicle context and custom instructions are the same for every part of a scan
+        cache_key = (tuple(sorted(vehicle_info.items())) if vehicle_info else (), custom_instructions)
+        context = self._prompt_context_cache.get(cache_key)
+        if context is None:
+            if len(self._prompt_context_cache) >= 32:
+                self._prompt_context_cache.clear()
+            context = self._build_prompt_context(vehicle_info, custom_instructions)
+            self._prompt_context_cache[cache_key] = context
+        return context
+    
+    def _build_prompt_context(self, vehicle_info, custom_instructions):
+        """Build the vehicle context and custom instruction sections of the analysis prompt"""
         # Build comprehensive vehicle context
         vehicle_context = ""
         if vehicle_info:
@@ -1905,33 +2953,17 @@ Save multiple instruction sets for different vehicle types or scenarios."""
             if detailed_specs:
                 vehicle_context += f"Vehicle Specifications: {', '.join(detailed_specs)}\n"
             
-            # Add parts fitment guidance based on vehicle specs
+            # Add parts fitment guidance based on vehicle specs (first matching rule per field)
             fitment_guidance = []
-            if vehicle_info.get('drive_type'):
-                drive_type = vehicle_info['drive_type'].lower()
-                if 'awd' in drive_type or 'all-wheel' in drive_type:
-                    fitment_guidance.append("AWD systems have unique drivetrain components - exclude FWD/RWD specific parts")
-                elif 'fwd' in drive_type or 'front-wheel' in drive_type:
-                    fitment_guidance.append("FWD vehicle - exclude RWD/AWD specific drivetrain parts")
-                elif 'rwd' in drive_type or 'rear-wheel' in drive_type:
-                    fitment_guidance.append("RWD vehicle - exclude FWD/AWD specific drivetrain parts")
-            
-            if vehicle_info.get('fuel_type'):
-                fuel_type = vehicle_info['fuel_type'].lower()
-                if 'diesel' in fuel_type:
-                    fitment_guidance.append("Diesel engine - fuel system parts differ significantly from gasoline")
-                elif 'gasoline' in fuel_type:
-                    fitment_guidance.append("Gasoline engine - exclude diesel-specific fuel system parts")
-            
-            if vehicle_info.get('body_class'):
-                body_class = vehicle_info['body_class'].lower()
-                if 'coupe' in body_class:
-                    fitment_guidance.append("Coupe body - some parts may differ from sedan variants")
-                elif 'sedan' in body_class:
-                    fitment_guidance.append("Sedan body - some parts may differ from coupe/hatchback variants")
-                elif 'suv' in body_class or 'truck' in body_class:
-                    fitment_guidance.append("SUV/Truck body - larger/heavier duty components than car variants")
-            
+            for field_name, rules in _FITMENT_RULES:
+                value = vehicle_info.get(field_name)
+                if not value:
+                    continue
+                value = value.lower()
+                for needles, guidance in rules:
+                    if any(needle in value for needle in needles):
+                        fitment_guidance.append(guidance)
+                        break
             
             if fitment_guidance:
                 vehicle_context += f"\n**PARTS FITMENT CONSIDERATIONS:**\n"
@@ -1941,49 +2973,19 @@ Save multiple instruction sets for different vehicle types or scenarios."""
         # Build custom instructions section
         custom_section = ""
         if custom_instructions:
+            # Squeeze padding and stacked blank lines out of pasted instructions - tokens, not meaning
+            instructions = _PROMPT_SPACES_RE.sub(' ', custom_instructions)
+            instructions = _PROMPT_BLANK_LINES_RE.sub('\n\n', instructions).strip()
             custom_section = f"""
 **CUSTOM ANALYSIS INSTRUCTIONS:**
 The user has provided these specific instructions for analyzing this vehicle's parts:
 
-{custom_instructions}
+{instructions}
 
 Please incorporate these instructions into your analysis and filtering decisions.
 """
         
-        # OPTIMIZATION 4: Streamlined AI prompt for faster processing
-        return f"""Analyze eBay "{part_name}" prices for junkyard business.{vehicle_context}{custom_section}
-
-**DATA:** CSV with Price,Shipping,Total,Title columns:
-{csv_data}
-
-**FILTER OUT:**
-1. Accessories/small parts (filters, gaskets, bulbs, connectors, etc.)
-2. New/aftermarket/premium items
-3. Wrong specifications for this vehicle
-4. Obvious outliers (damaged cores or overpriced items)
-{"5. Items under $" + str(min_price) if min_price > 0 else ""}
-
-**CONFIDENCE RULES:**
-- RED if majority of data is wrong engine size/transmission/drivetrain type
-- RED if mostly inappropriate listings  
-- ORANGE if poor data quality or small sample
-- YELLOW if mixed quality
-- LIGHT_GREEN if good appropriate data
-- DARK_GREEN if excellent high-quality data
-
-**OUTPUT JSON:**
-{{
-    "low_price": [10-20th percentile, rounded],
-    "average_price": [25-40th percentile, rounded], 
-    "high_price": [45-60th percentile, rounded],
-    "items_analyzed": [total count],
-    "items_filtered_out": [removed count],
-    "reasoning": "[brief filter logic]",
-    "confidence_rating": "[dark_green/light_green/yellow/orange/red]",
-    "confidence_explanation": "[brief confidence reason]"
-}}
-
-Return only valid JSON."""
+        return vehicle_context + custom_section
     
     def clear_all_tabs(self):
         """Clear all tabs and reset for new calculation"""
@@ -2000,54 +3002,81 @@ Return only valid JSON."""
         self.part_frames.clear()
         self.part_tables.clear()
     
-    def calculate_bid(self):
+    def _submit_calculate(self):
+        """Validate the VIN and hand the scan off to the background worker"""
         vin = self.vin_entry.get().strip().upper()
         
-        if not vin or len(vin) != 17:
-            messagebox.showerror("Invalid VIN", "Please enter a valid 17-character VIN")
+        if not _VIN_RE.match(vin):
+            messagebox.showerror("Invalid VIN", "Please enter a valid 17-character VIN (letters I, O and Q are not allowed)")
             return
         
         # Store current VIN for history
         self.current_vin = vin
         
+        # Snapshot the custom instructions here - the worker must not read Tk widgets
+        self.current_custom_instructions = self.get_custom_ai_instructions()
+        
         # Clear all tabs for new calculation
         self.clear_all_tabs()
         
         # Start with debug tab selected to show progress
         self.notebook.select(self.debug_frame)
+        self.calculate_btn.config(state='disabled')
         
-        self.results_text.insert(tk.END, "Processing VIN...\n")
-        self.root.update()
-        
-        vehicle_info = self.decode_vin(vin)
-        if not vehicle_info:
-            self.display_error("Could not decode VIN or retrieve vehicle information")
-            return
-        
-        # Store vehicle info for AI analysis
-        self.current_vehicle_info = vehicle_info
-        
-        self.results_text.insert(tk.END, f"Vehicle: {vehicle_info['year']} {vehicle_info['make']} {vehicle_info['model']}\n")
-        self.results_text.insert(tk.END, "Searching for parts prices...\n")
-        self.root.update()
-        
-        parts_prices = self.search_ebay_parts(vehicle_info)
-        bid_analysis = self.calculate_recommended_bid(parts_prices)
-        
-        self.display_results(vehicle_info, parts_prices, bid_analysis)
+        self.executor.submit(self._run_pipeline, vin)
+    
+    def _run_pipeline(self, vin):
+        """Decode, search and price a VIN (runs on the worker thread)"""
+        try:
+            self._log("Processing VIN...\n")
+            
+            # Pick up a Gemini key added to .env since startup (no-op if unchanged)
+            self.reload_gemini()
+            
+            vehicle_info = self.decode_vin(vin)
+            if self._closing.is_set():
+                return
+            if not vehicle_info:
+                self.display_error("Could not decode VIN or retrieve vehicle information")
+                return
+            
+            # Store vehicle info for AI analysis
+            self.current_vehicle_info = vehicle_info
+            
+            self._log(f"Vehicle: {vehicle_info['year']} {vehicle_info['make']} {vehicle_info['model']}\n")
+            self._log("Searching for parts prices...\n")
+            
+            parts_prices = self.search_ebay_parts(vehicle_info)
+            if self._closing.is_set():
+                return
+            bid_analysis = self.calculate_recommended_bid(parts_prices)
+            
+            self.ui_queue.put(('final_output', (vehicle_info, parts_prices, bid_analysis)))
+            self.ui_queue.put(('add_history', (vin, vehicle_info, parts_prices, bid_analysis)))
+        except Exception as e:
+            self.display_error(f"Scan failed: {str(e)}")
+        finally:
+            self.ui_queue.put(('done', None))
     
     def display_results(self, vehicle_info: Dict, parts_prices: Dict[str, dict], bid_analysis: Dict):
-        # Clear and populate the Final Output tab
-        self.final_output_text.delete(1.0, tk.END)
+        # Build the whole report first as (text, tag) segments, then hand them to the Text
+        # widget in one multi-segment insert
+        segments = [("=== AUCTION BID ANALYSIS ===\n\n", 'hdr')]
+        lines = []
+        
+        def end_segment(tag=''):
+            segments.append(("".join(lines), tag))
+            lines.clear()
         
-        self.final_output_text.insert(tk.END, f"=== AUCTION BID ANALYSIS ===\n\n")
+        # Display names for each part, shared by the rows, warnings and explanations
+        labels = {part: part.capitalize() for part in parts_prices}
         
         # Display comprehensive vehicle information
         base_vehicle = f"{vehicle_info['year']} {vehicle_info['make']} {vehicle_info['model']}"
-        self.final_output_text.insert(tk.END, f"Vehicle: {base_vehicle}")
+        lines.append(f"Vehicle: {base_vehicle}")
         if vehicle_info.get('trim'):
-            self.final_output_text.insert(tk.END, f" {vehicle_info['trim']}")
-        self.final_output_text.insert(tk.END, f"\n")
+            lines.append(f" {vehicle_info['trim']}")
+        lines.append("\n")
         
         # Add vehicle specifications that affect parts compatibility
         spec_lines = []
@@ -2081,116 +3110,110 @@ Return only valid JSON."""
             specs_text = f"Specs: {' | '.join(spec_lines)}"
             if drive_line:
                 specs_text += f" | {drive_line}"
-            self.final_output_text.insert(tk.END, f"{specs_text}\n")
+            lines.append(f"{specs_text}\n")
             if fuel_body_line:
-                self.final_output_text.insert(tk.END, f"{fuel_body_line}\n")
+                lines.append(f"{fuel_body_line}\n")
         
-        self.final_output_text.insert(tk.END, f"\n")
+        lines.append("\n")
+        end_segment()
         
         # Display parts breakdown with pricing tiers and confidence
-        self.final_output_text.insert(tk.END, f"{'Part':<20} {'Budget':<10} {'Standard':<10} {'Premium':<10} {'Confidence':<15}\n")
-        self.final_output_text.insert(tk.END, f"{'Tier':<20} {'Tier':<10} {'Tier':<10} {'Tier':<10} {'Rating':<15}\n")
-        self.final_output_text.insert(tk.END, "-" * 80 + "\n")
-        
-        # Define confidence display mapping
-        confidence_display = {
-            'dark_green': '🟢 High',
-            'light_green': '🟢 Good', 
-            'yellow': '🟡 Medium',
-            'orange': '🟠 Low',
-            'red': '🔴 Poor'
-        }
+        lines.append(f"{'Part':<20} {'Budget':<10} {'Standard':<10} {'Premium':<10} {'Confidence':<15}\n")
+        lines.append(f"{'Tier':<20} {'Tier':<10} {'Tier':<10} {'Tier':<10} {'Rating':<15}\n")
+        lines.append("-" * 80 + "\n")
+        
+        # One pass collects the rows plus the warning, explanation and failed-part lists
+        confidence_warnings = []
+        confidence_explanations = []
+        failed_parts = []
+        duplicates_removed = 0
         
         for part, prices in parts_prices.items():
+            label = labels[part]
             if isinstance(prices, dict):
-                low = prices.get('low', 0)
-                avg = prices.get('average', 0)
-                high = prices.get('high', 0)
+                duplicates_removed += prices.get('duplicates_removed', 0)
                 confidence = prices.get('confidence_rating', 'yellow')
-                confidence_text = confidence_display.get(confidence, '🟡 Unknown')
-                self.final_output_text.insert(tk.END, f"{part.capitalize():<20} ${low:<9.2f} ${avg:<9.2f} ${high:<9.2f} {confidence_text:<15}\n")
+                confidence_text = _CONFIDENCE_DISPLAY.get(confidence, '🟡 Unknown')
+                lines.append(_ROW_FMT(label, prices.get('low', 0), prices.get('average', 0),
+                                      prices.get('high', 0), confidence_text))
+                
+                if confidence in LOW_CONF_SET:
+                    confidence_warnings.append(f"• {label}: {_CONFIDENCE_DISPLAY.get(confidence, confidence)} confidence\n")
+                
+                confidence_explanation = prices.get('confidence_explanation', '')
+                if confidence_explanation and prices.get('items_analyzed', 0) > 0:
+                    confidence_explanations.append(f"• {label}: {confidence_explanation}\n")
+                
+                if prices['low'] == 0 and prices['average'] == 0 and prices['high'] == 0:
+                    failed_parts.append(part)
             else:
                 # Fallback for old format
-                self.final_output_text.insert(tk.END, f"{part.capitalize():<20} ${prices:<9.2f} ${prices:<9.2f} ${prices:<9.2f} {'🟡 Legacy':<15}\n")
+                lines.append(_ROW_FMT(label, prices, prices, prices, '🟡 Legacy'))
+                if prices == 0:
+                    failed_parts.append(part)
         
         # Display totals
         totals = bid_analysis['totals']
         bids = bid_analysis['bids']
         
-        self.final_output_text.insert(tk.END, "-" * 80 + "\n")
-        self.final_output_text.insert(tk.END, f"{'TOTALS:':<20} ${totals['low']:<9.2f} ${totals['average']:<9.2f} ${totals['high']:<9.2f}\n\n")
+        lines.append("-" * 80 + "\n")
+        lines.append(f"{'TOTALS:':<20} ${totals['low']:<9.2f} ${totals['average']:<9.2f} ${totals['high']:<9.2f}\n\n")
+        
+        end_segment()
         
         # Display recommended bids based on pricing tiers
-        self.final_output_text.insert(tk.END, "RECOMMENDED AUCTION BIDS (Dynamic Formula):\n")
-        self.final_output_text.insert(tk.END, f"Budget-based bid:    ${bids['low']:.2f}  (if you expect lower-grade parts)\n")
-        self.final_output_text.insert(tk.END, f"Standard bid:        ${bids['average']:.2f}  (typical market pricing)\n")
-        self.final_output_text.insert(tk.END, f"Premium bid:         ${bids['high']:.2f}  (if vehicle is in great condition)\n\n")
+        lines.append("RECOMMENDED AUCTION BIDS (Dynamic Formula):\n")
+        lines.append(f"Budget-based bid:    ${bids['low']:.2f}  (if you expect lower-grade parts)\n")
+        lines.append(f"Standard bid:        ${bids['average']:.2f}  (typical market pricing)\n")
+        lines.append(f"Premium bid:         ${bids['high']:.2f}  (if vehicle is in great condition)\n\n")
+        end_segment('bold')
         
         # Show confidence warnings and explanations
-        confidence_warnings = []
-        confidence_explanations = []
-        
-        for part, prices in parts_prices.items():
-            if isinstance(prices, dict):
-                confidence = prices.get('confidence_rating', 'yellow')
-                confidence_explanation = prices.get('confidence_explanation', '')
-                items_analyzed = prices.get('items_analyzed', 0)
-                items_filtered = prices.get('items_filtered_out', 0)
-                
-                if confidence in ['orange', 'red']:
-                    confidence_warnings.append(f"• {part.capitalize()}: {confidence_display.get(confidence, confidence)} confidence")
-                
-                if confidence_explanation and items_analyzed > 0:
-                    confidence_explanations.append(f"• {part.capitalize()}: {confidence_explanation}")
-        
         if confidence_warnings:
-            self.final_output_text.insert(tk.END, "⚠️  CONFIDENCE WARNINGS:\n")
-            for warning in confidence_warnings:
-                self.final_output_text.insert(tk.END, f"{warning}\n")
-            self.final_output_text.insert(tk.END, "\n")
+            lines.append("⚠️  CONFIDENCE WARNINGS:\n")
+            lines.extend(confidence_warnings)
+            lines.append("\n")
+            end_segment('warn')
         
         if confidence_explanations:
-            self.final_output_text.insert(tk.END, "AI CONFIDENCE EXPLANATIONS:\n")
-            for explanation in confidence_explanations:
-                self.final_output_text.insert(tk.END, f"{explanation}\n")
-            self.final_output_text.insert(tk.END, "\n")
+            lines.append("AI CONFIDENCE EXPLANATIONS:\n")
+            lines.extend(confidence_explanations)
+            lines.append("\n")
         
-        # Show which parts failed and why
-        failed_parts = []
-        for part, prices in parts_prices.items():
-            if isinstance(prices, dict):
-                if prices['low'] == 0 and prices['average'] == 0 and prices['high'] == 0:
-                    failed_parts.append(part)
-            elif prices == 0:
-                failed_parts.append(part)
+        if duplicates_removed:
+            lines.append(f"Duplicate listings removed before pricing: {duplicates_removed}\n\n")
         
+        # Show which parts failed and why
         if failed_parts:
-            self.final_output_text.insert(tk.END, f"FAILED PARTS: {', '.join(failed_parts)}\n")
-            self.final_output_text.insert(tk.END, "Check search terms or category IDs for these parts.\n\n")
+            lines.append(f"FAILED PARTS: {', '.join(failed_parts)}\n")
+            lines.append("Check search terms or category IDs for these parts.\n\n")
+        
+        end_segment()
+        
+        # Clear and populate the Final Output tab (insert takes text, tag, text, tag, ...)
+        self.final_output_text.delete(1.0, tk.END)
+        self.final_output_text.insert(tk.END, *(part for segment in segments for part in segment))
         
         # Auto-scroll to top to show the final analysis
         self.final_output_text.see(1.0)
         
         # Also add debug info to the debug tab
-        self.results_text.insert(tk.END, "\n" + "="*80 + "\n")
-        self.results_text.insert(tk.END, f"=== PROCESSING COMPLETE ===\n")
-        self.results_text.insert(tk.END, f"Found {len(parts_prices)} parts\n")
-        self.results_text.insert(tk.END, f"eBay token exists: {bool(self.ebay_access_token)}\n")
-        self.results_text.insert(tk.END, f"Client ID loaded: {bool(self.ebay_client_id)}\n")
-        self.results_text.insert(tk.END, f"Client Secret loaded: {bool(self.ebay_client_secret)}\n")
+        debug_lines = [
+            "\n" + "="*80 + "\n",
+            "=== PROCESSING COMPLETE ===\n",
+            f"Found {len(parts_prices)} parts\n",
+            f"eBay token exists: {bool(self.ebay_access_token)}\n",
+            f"Client ID loaded: {bool(self.ebay_client_id)}\n",
+            f"Client Secret loaded: {bool(self.ebay_client_secret)}\n",
+        ]
         if failed_parts:
-            self.results_text.insert(tk.END, f"FAILED PARTS: {', '.join(failed_parts)}\n")
-        self.results_text.insert(tk.END, f"Results displayed in Final Output tab.\n")
+            debug_lines.append(f"FAILED PARTS: {', '.join(failed_parts)}\n")
+        debug_lines.append("Results displayed in Final Output tab.\n")
+        self.results_text.insert(tk.END, "".join(debug_lines))
         self.results_text.see(tk.END)
-        
-        # Save to VIN history
-        self.add_to_vin_history(getattr(self, 'current_vin', ''), vehicle_info, parts_prices, bid_analysis)
-        
-        # Switch to the Final Output tab to show the results
-        self.notebook.select(self.final_output_frame)
     
     def display_error(self, message: str):
-        self.results_text.insert(tk.END, f"ERROR: {message}\n")
+        self._log(f"ERROR: {message}\n")
 
 def main():
     root = tk.Tk()
@@ -13,6 +13,9 @@ from dotenv import load_dotenv
 import google.generativeai as genai
 from openai import OpenAI
 
+# Valid 17-character VIN (letters I, O and Q are never used)
+_VIN_RE = re.compile(r'^[A-HJ-NPR-Z0-9]{17}$')
+
 # Load environment variables
 load_dotenv()
 
@@ -2242,8 +2245,8 @@ Return only valid JSON."""
     def calculate_bid(self):
         vin = self.vin_entry.get().strip().upper()
         
-        if not vin or len(vin) != 17:
-            messagebox.showerror("Invalid VIN", "Please enter a valid 17-character VIN")
+        if not _VIN_RE.match(vin):
+            messagebox.showerror("Invalid VIN", "Please enter a valid 17-character VIN (letters I, O and Q are not allowed)")
             return
         
         # Store current VIN for history
@@ -4,69 +4,157 @@ import requests
 import csv
 import json
 import os
+import queue
+import sys
 import base64
+import datetime
+import statistics
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Optional
 
 # Load environment variables
 load_dotenv()
 
+_VIN_CACHE_FILE = '.vin_cache.json'
+
+# NHTSA decode variables -> vehicle_info keys
+_VIN_CORE_FIELDS = {
+    'Make': 'make',
+    'Model': 'model',
+    'Model Year': 'year',
+}
+
+# Listing row for the run_test table; template parsed once
+_ITEM_ROW_FMT = "{:<3} ${:<9.2f} {:<8} ${:<9.2f} {}".format
+
 class EbayTestRunner:
+    # Used only, fixed price; the per-part price floor is appended in search_ebay_part
+    _BASE_FILTERS = ('conditionIds:{3000}', 'buyingOptions:{FIXED_PRICE}')
+    
     def __init__(self):
         self.ebay_client_id = os.getenv('EBAY_CLIENT_ID')
         self.ebay_client_secret = os.getenv('EBAY_CLIENT_SECRET')
         self.ebay_environment = os.getenv('EBAY_ENVIRONMENT', 'PRODUCTION')
+        # OAuth client-credentials header, encoded once
+        self._basic_auth_header = None
+        if self.ebay_client_id and self.ebay_client_secret:
+            credentials = f"{self.ebay_client_id}:{self.ebay_client_secret}"
+            self._basic_auth_header = f"Basic {base64.b64encode(credentials.encode()).decode()}"
+        # eBay Browse API endpoint
+        if self.ebay_environment == 'PRODUCTION':
+            self._search_url = "https://api.ebay.com/buy/browse/v1/item_summary/search"
+        else:
+            self._search_url = "https://api.sandbox.ebay.com/buy/browse/v1/item_summary/search"
         self.ebay_access_token = None
+        self._ebay_headers = {}
+        # Serializes token refreshes when several run_test_all workers see a 401 together
+        self._token_lock = threading.Lock()
+        # Same file and format as the main app, so either one can reuse the other's token
+        self.ebay_token_file = os.path.join(os.path.expanduser('~'), '.phx_pricing', 'ebay_token.json')
+        # One keep-alive session for every call; 429/5xx are retried with backoff and Retry-After honoured
+        self._http = requests.Session()
+        self._http.mount('https://', HTTPAdapter(
+            pool_connections=16, pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504],
+                              respect_retry_after_header=True, raise_on_status=False)))
+        self._http.headers.update({'Accept-Encoding': 'gzip'})
+        # Cap in-flight Browse API calls so parallel part searches don't trip eBay's rate limit
+        self._ebay_sem = threading.BoundedSemaphore(8)
         self.parts_list = []
+        self._parts_index = {}
+        self._part_names = []
         self.load_parts_list()
+        self._vin_cache = self._load_vin_cache()
+    
+    def _load_vin_cache(self) -> Dict:
+        try:
+            with open(_VIN_CACHE_FILE, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+    
+    def _save_vin_cache(self):
+        try:
+            with open(_VIN_CACHE_FILE, 'w', encoding='utf-8') as file:
+                json.dump(self._vin_cache, file)
+        except OSError as e:
+            print(f"Could not save VIN cache: {str(e)}")
     
     def load_parts_list(self):
         try:
-            with open('category_mapping.csv', 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
+            with open('category_mapping.csv', 'r', encoding='utf-8', newline='') as file:
+                # Plain reader with header positions looked up once - no dict built per row
+                reader = csv.reader(file)
+                header = next(reader, [])
+                query_idx = header.index('search_query')
+                category_idx = header.index('category_id')
+                price_idx = header.index('min_price') if 'min_price' in header else None
+                width = max(query_idx, category_idx, price_idx or 0) + 1
                 for row in reader:
-                    if row['search_query'] and row['category_id']:
+                    if len(row) >= width and row[query_idx] and row[category_idx]:
                         self.parts_list.append({
-                            'search_query': row['search_query'],
-                            'category_id': row['category_id'],
-                            'min_price': float(row.get('min_price', 0))
+                            'search_query': row[query_idx],
+                            'category_id': row[category_idx],
+                            'min_price': float(row[price_idx]) if price_idx is not None else 0.0
                         })
         except FileNotFoundError:
             print("category_mapping.csv not found!")
             return
+        
+        # Case-insensitive lookup for run_test, plus the names listed when a part isn't found
+        self._parts_index = {part['search_query'].lower(): part for part in self.parts_list}
+        self._part_names = sorted(part['search_query'] for part in self.parts_list)
     
     def decode_vin(self, vin: str) -> Optional[Dict]:
+        # VIN -> year/make/model never changes, so a decoded VIN is only fetched once
+        vin = vin.upper()
+        cached = self._vin_cache.get(vin)
+        if cached:
+            print(f"Vehicle (cached): {cached['year']} {cached['make']} {cached['model']}")
+            return dict(cached)
+        
         url = f"https://vpic.nhtsa.dot.gov/api/vehicles/decodevin/{vin}?format=json"
         
         try:
             print(f"Decoding VIN: {vin}")
-            response = requests.get(url, timeout=20)
+            response = self._http.get(url, timeout=20)
             response.raise_for_status()
             
             data = response.json()
             if data.get('Results'):
                 vehicle_info = {}
                 for result in data['Results']:
-                    if result['Variable'] == 'Make':
-                        vehicle_info['make'] = result['Value']
-                    elif result['Variable'] == 'Model':
-                        vehicle_info['model'] = result['Value']
-                    elif result['Variable'] == 'Model Year':
-                        vehicle_info['year'] = result['Value']
+                    key = _VIN_CORE_FIELDS.get(result['Variable'])
+                    if key is None:
+                        continue
+                    vehicle_info[key] = result['Value']
+                    # Rest of the ~130 variables aren't used here
+                    if len(vehicle_info) == len(_VIN_CORE_FIELDS):
+                        break
                 
-                if all(v for v in vehicle_info.values()):
+                if len(vehicle_info) == len(_VIN_CORE_FIELDS) and all(vehicle_info.values()):
                     print(f"Vehicle: {vehicle_info['year']} {vehicle_info['make']} {vehicle_info['model']}")
+                    self._vin_cache[vin] = dict(vehicle_info)
+                    self._save_vin_cache()
                     return vehicle_info
                         
         except Exception as e:
             print(f"VIN decode error: {str(e)}")
             return None
     
-    def get_ebay_access_token(self) -> bool:
+    def get_ebay_access_token(self, use_cache: bool = True) -> bool:
         if not self.ebay_client_id or not self.ebay_client_secret:
             print("ERROR: eBay credentials not found in .env file")
             return False
         
+        if use_cache and self._load_cached_ebay_token():
+            print("Using cached eBay token")
+            return True
+        
         try:
             if self.ebay_environment == 'PRODUCTION':
                 oauth_url = "https://api.ebay.com/identity/v1/oauth2/token"
@@ -75,7 +163,7 @@ class EbayTestRunner:
             
             headers = {
                 'Content-Type': 'application/x-www-form-urlencoded',
-                'Authorization': f'Basic {self._encode_credentials()}'
+                'Authorization': self._basic_auth_header
             }
             
             data = {
@@ -83,13 +171,15 @@ class EbayTestRunner:
                 'scope': 'https://api.ebay.com/oauth/api_scope'
             }
             
-            response = requests.post(oauth_url, headers=headers, data=data, timeout=10)
+            response = self._http.post(oauth_url, headers=headers, data=data, timeout=10)
             response.raise_for_status()
             
             token_data = response.json()
             self.ebay_access_token = token_data.get('access_token')
             
             if self.ebay_access_token:
+                self._set_ebay_headers()
+                self._save_cached_ebay_token(token_data.get('expires_in', 7200))
                 print("eBay authentication successful!")
                 return True
             else:
@@ -100,84 +190,124 @@ class EbayTestRunner:
             print(f"ERROR: Failed to get eBay access token: {str(e)}")
             return False
     
-    def _encode_credentials(self) -> str:
-        credentials = f"{self.ebay_client_id}:{self.ebay_client_secret}"
-        return base64.b64encode(credentials.encode()).decode()
+    def _set_ebay_headers(self):
+        # Built once per token and passed per request, so the bearer never rides along to NHTSA
+        self._ebay_headers = {
+            'Authorization': f'Bearer {self.ebay_access_token}',
+            'Content-Type': 'application/json'
+        }
+    
+    def _load_cached_ebay_token(self) -> bool:
+        """Adopt a token saved by an earlier run if it has more than 5 minutes left (enough for run_test_all)"""
+        try:
+            with open(self.ebay_token_file, 'r', encoding='utf-8') as file:
+                cached = json.load(file)
+            if cached.get('environment', self.ebay_environment) != self.ebay_environment:
+                return False
+            expiry = datetime.datetime.fromisoformat(cached['expiry_iso'])
+            if datetime.datetime.now() >= expiry - datetime.timedelta(minutes=5):
+                return False
+            self.ebay_access_token = cached['token']
+            self._set_ebay_headers()
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"Failed to load cached eBay token: {str(e)}")
+            return False
+    
+    def _save_cached_ebay_token(self, expires_in):
+        try:
+            os.makedirs(os.path.dirname(self.ebay_token_file), exist_ok=True)
+            expiry = datetime.datetime.now() + datetime.timedelta(seconds=int(expires_in))
+            payload = json.dumps({
+                'token': self.ebay_access_token,
+                'expiry_iso': expiry.isoformat(),
+                'environment': self.ebay_environment
+            })
+            
+            # Owner-only permissions from the start, swapped in atomically
+            tmp_path = self.ebay_token_file + '.tmp'
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                file.write(payload)
+            os.replace(tmp_path, self.ebay_token_file)
+        except Exception as e:
+            print(f"Failed to save eBay token: {str(e)}")
+    
+    def _refresh_ebay_token(self, stale_token) -> bool:
+        """Fetch a new token after a 401, unless another worker already replaced stale_token"""
+        with self._token_lock:
+            if self.ebay_access_token == stale_token:
+                self.ebay_access_token = None
+                self.get_ebay_access_token(use_cache=False)
+            return bool(self.ebay_access_token)
+    
+    def _ebay_get(self, url, **kwargs):
+        """GET against the Browse API; 429/503 backoff is handled by the session's Retry"""
+        token = self.ebay_access_token
+        with self._ebay_sem:
+            response = self._http.get(url, headers=self._ebay_headers, **kwargs)
+        # Token revoked or expired mid-run - refresh once and retry
+        if response.status_code == 401 and self._refresh_ebay_token(token):
+            with self._ebay_sem:
+                response = self._http.get(url, headers=self._ebay_headers, **kwargs)
+        return response
     
     def search_ebay_part(self, vehicle_info: Dict, part: Dict) -> List[Dict]:
         if not self.ebay_access_token and not self.get_ebay_access_token():
             return []
         
-        # eBay Browse API endpoint
-        if self.ebay_environment == 'PRODUCTION':
-            search_url = "https://api.ebay.com/buy/browse/v1/item_summary/search"
-        else:
-            search_url = "https://api.sandbox.ebay.com/buy/browse/v1/item_summary/search"
-        
-        headers = {
-            'Authorization': f'Bearer {self.ebay_access_token}',
-            'Content-Type': 'application/json'
-        }
-        
         try:
             # Build search query with vehicle info
             search_query = f"{vehicle_info['year']} {vehicle_info['make']} {vehicle_info['model']} {part['search_query']}"
             
             # Add minimum price filter to exclude small accessories
-            price_filter = f"price:[{part['min_price']}..]" if part['min_price'] > 0 else ""
-            condition_filter = "conditionIds:{3000}"  # Used only
-            buying_filter = "buyingOptions:{FIXED_PRICE}"
-            
-            # Combine filters with proper syntax
-            filters = [condition_filter, buying_filter]
-            if price_filter:
-                filters.append(price_filter)
+            min_price = part['min_price']
+            filters = self._BASE_FILTERS + ((f"price:[{min_price}..]",) if min_price > 0 else ())
             
             params = {
                 'q': search_query,
                 'category_ids': part['category_id'],
                 'filter': ','.join(filters),
                 'sort': 'price',
-                'limit': '200'
+                'limit': '200',
+                'fieldgroups': 'MATCHING_ITEMS'
             }
             
             print(f"\nSearching: {search_query}")
-            print(f"Category: {part['category_id']}, Min Price: ${part['min_price']}")
+            print(f"Category: {part['category_id']}, Min Price: ${min_price}")
             
-            response = requests.get(search_url, headers=headers, params=params, timeout=10)
+            response = self._ebay_get(self._search_url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
             items = []
             
-            if 'itemSummaries' in data:
-                for item in data['itemSummaries']:
-                    if 'price' in item and 'value' in item['price']:
-                        try:
-                            price = float(item['price']['value'])
-                            
-                            # Add shipping cost if present
-                            shipping_cost = 0.0
-                            if 'shippingOptions' in item and item['shippingOptions']:
-                                shipping_option = item['shippingOptions'][0]  # Take first shipping option
-                                if 'shippingCost' in shipping_option and 'value' in shipping_option['shippingCost']:
-                                    shipping_cost = float(shipping_option['shippingCost']['value'])
-                            
-                            total_price = price + shipping_cost
-                            min_price = part.get('min_price', 10)
-                            
-                            if min_price <= total_price <= 5000:
-                                items.append({
-                                    'title': item.get('title', 'No title'),
-                                    'price': price,
-                                    'shipping': shipping_cost,
-                                    'total_price': total_price,
-                                    'itemId': item.get('itemId', ''),
-                                    'condition': item.get('condition', ''),
-                                    'location': item.get('itemLocation', {}).get('country', '')
-                                })
-                        except (ValueError, TypeError):
-                            continue
+            for item in data.get('itemSummaries') or ():
+                # Null-safe .get chains: items missing a price are skipped without raising
+                price_value = (item.get('price') or {}).get('value')
+                if price_value is None:
+                    continue
+                # Take first shipping option, if any
+                shipping_option = (item.get('shippingOptions') or [{}])[0]
+                shipping_value = (shipping_option.get('shippingCost') or {}).get('value')
+                try:
+                    price = float(price_value)
+                    shipping_cost = float(shipping_value) if shipping_value is not None else 0.0
+                except (ValueError, TypeError):
+                    continue
+                
+                total_price = price + shipping_cost
+                if min_price <= total_price <= 5000:
+                    items.append({
+                        'title': item.get('title', 'No title'),
+                        'price': price,
+                        'shipping': shipping_cost,
+                        'total_price': total_price,
+                        'itemId': item.get('itemId', ''),
+                        'condition': item.get('condition', '')
+                    })
             
             print(f"Found {len(items)} valid items")
             return items
@@ -189,75 +319,166 @@ class EbayTestRunner:
                 print(f"Response text: {e.response.text[:500]}")
             return []
     
+    def _prepare_vehicle(self, vin: str) -> Optional[Dict]:
+        # Decode VIN - the eBay OAuth exchange doesn't depend on it, so run both round trips at once
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            token_future = pool.submit(self.get_ebay_access_token) if not self.ebay_access_token else None
+            vehicle_info = self.decode_vin(vin)
+            if token_future is not None:
+                token_future.result()
+        if not vehicle_info:
+            print("Failed to decode VIN. Exiting.")
+        return vehicle_info
+    
+    def _compute_stats(self, items: List[Dict]) -> Dict:
+        # Basic statistics using total price (price + shipping), gathered in one pass
+        total_prices = []
+        paid_count = 0
+        ship_sum = 0.0
+        ship_min = ship_max = None
+        for item in items:
+            total_prices.append(item['total_price'])
+            shipping = item['shipping']
+            if shipping > 0:
+                paid_count += 1
+                ship_sum += shipping
+                if ship_min is None or shipping < ship_min:
+                    ship_min = shipping
+                if ship_max is None or shipping > ship_max:
+                    ship_max = shipping
+        
+        return {
+            'count': len(total_prices),
+            'min': min(total_prices),
+            'max': max(total_prices),
+            'median': statistics.median(total_prices),
+            'average': sum(total_prices) / len(total_prices),
+            'free_shipping': len(items) - paid_count,
+            'avg_shipping': ship_sum / paid_count if paid_count else None,
+            'ship_min': ship_min,
+            'ship_max': ship_max
+        }
+    
+    def _print_stats(self, stats: Dict):
+        print(f"\n=== PRICE STATISTICS (INCLUDING SHIPPING) ===")
+        print(f"Total items: {stats['count']}")
+        print(f"Total price range: ${stats['min']:.2f} - ${stats['max']:.2f}")
+        print(f"Median total: ${stats['median']:.2f}")
+        print(f"Average total: ${stats['average']:.2f}")
+        
+        # Show shipping statistics
+        print(f"\n=== SHIPPING STATISTICS ===")
+        print(f"Free shipping items: {stats['free_shipping']}/{stats['count']}")
+        if stats['avg_shipping'] is not None:
+            print(f"Avg shipping cost: ${stats['avg_shipping']:.2f}")
+            print(f"Shipping range: ${stats['ship_min']:.2f} - ${stats['ship_max']:.2f}")
+    
+    def _export_csv(self, filename: str, items: List[Dict]):
+        with open(filename, 'w', newline='', encoding='utf-8', buffering=1 << 16) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['Index', 'Price', 'Shipping', 'Total_Price', 'Title', 'ItemID', 'Condition'])
+            writer.writerows(
+                (i, item['price'], item['shipping'], item['total_price'], item['title'], item['itemId'], item['condition'])
+                for i, item in enumerate(items, 1)
+            )
+    
+    def _process_part(self, vehicle_info: Dict, part: Dict):
+        """Search one part and summarize it; returns (items, stats), stats is None when nothing was found"""
+        items = self.search_ebay_part(vehicle_info, part)
+        return items, (self._compute_stats(items) if items else None)
+    
     def run_test(self, vin: str, part_name: str):
         print("="*60)
         print(f"EBAY DATA TEST - VIN: {vin}, PART: {part_name}")
         print("="*60)
         
-        # Decode VIN
-        vehicle_info = self.decode_vin(vin)
+        vehicle_info = self._prepare_vehicle(vin)
         if not vehicle_info:
-            print("Failed to decode VIN. Exiting.")
             return
         
         # Find the part in our list
-        target_part = None
-        for part in self.parts_list:
-            if part['search_query'].lower() == part_name.lower():
-                target_part = part
-                break
+        target_part = self._parts_index.get(part_name.lower())
         
         if not target_part:
             print(f"Part '{part_name}' not found in parts_list.csv")
-            print("Available parts:", [p['search_query'] for p in self.parts_list])
+            print("Available parts:", self._part_names)
             return
         
         # Search eBay for this part
-        items = self.search_ebay_part(vehicle_info, target_part)
+        items, stats = self._process_part(vehicle_info, target_part)
         
         if not items:
             print("No items found!")
             return
         
-        # Display results
-        print(f"\n{'#':<3} {'Price':<10} {'Ship':<8} {'Total':<10} {'Title':<60}")
-        print("-" * 95)
-        
+        # Display results - rows are joined and written in one go rather than printed one by one
+        lines = [f"\n{'#':<3} {'Price':<10} {'Ship':<8} {'Total':<10} {'Title':<60}", "-" * 95]
         for i, item in enumerate(items, 1):
-            title_truncated = item['title'][:57] + "..." if len(item['title']) > 60 else item['title']
-            shipping_display = f"${item['shipping']:.2f}" if item['shipping'] > 0 else "FREE"
-            print(f"{i:<3} ${item['price']:<9.2f} {shipping_display:<8} ${item['total_price']:<9.2f} {title_truncated}")
-        
-        # Basic statistics using total price (price + shipping)
-        total_prices = [item['total_price'] for item in items]
-        total_prices.sort()
+            title = item['title']
+            shipping = item['shipping']
+            lines.append(_ITEM_ROW_FMT(i, item['price'], f"${shipping:.2f}" if shipping > 0 else "FREE",
+                                       item['total_price'], title[:57] + "..." if len(title) > 60 else title))
+        sys.stdout.write("\n".join(lines) + "\n")
         
-        print(f"\n=== PRICE STATISTICS (INCLUDING SHIPPING) ===")
-        print(f"Total items: {len(total_prices)}")
-        print(f"Total price range: ${min(total_prices):.2f} - ${max(total_prices):.2f}")
-        print(f"Median total: ${total_prices[len(total_prices)//2]:.2f}")
-        print(f"Average total: ${sum(total_prices)/len(total_prices):.2f}")
-        
-        # Show shipping statistics
-        shipping_costs = [item['shipping'] for item in items if item['shipping'] > 0]
-        free_shipping_count = len([item for item in items if item['shipping'] == 0])
-        
-        print(f"\n=== SHIPPING STATISTICS ===")
-        print(f"Free shipping items: {free_shipping_count}/{len(items)}")
-        if shipping_costs:
-            print(f"Avg shipping cost: ${sum(shipping_costs)/len(shipping_costs):.2f}")
-            print(f"Shipping range: ${min(shipping_costs):.2f} - ${max(shipping_costs):.2f}")
+        self._print_stats(stats)
         
         # Export to CSV for your analysis
         filename = f"ebay_data_{part_name}_{vin[-6:]}.csv"
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(['Index', 'Price', 'Shipping', 'Total_Price', 'Title', 'ItemID', 'Condition'])
-            for i, item in enumerate(items, 1):
-                writer.writerow([i, item['price'], item['shipping'], item['total_price'], item['title'], item['itemId'], item['condition']])
+        self._export_csv(filename, items)
         
         print(f"\nData exported to: {filename}")
         print("You can now analyze this data with your own statistical models!")
+    
+    def run_test_all(self, vin: str, max_workers: int = 8):
+        """Search every part in category_mapping.csv for one VIN, several searches in flight at once"""
+        print("="*60)
+        print(f"EBAY DATA TEST - VIN: {vin}, ALL {len(self.parts_list)} PARTS")
+        print("="*60)
+        
+        vehicle_info = self._prepare_vehicle(vin)
+        if not vehicle_info or not self.ebay_access_token:
+            return
+        
+        # A single writer thread drains finished parts to disk while the searches keep going
+        write_queue = queue.Queue()
+        
+        def _writer():
+            while True:
+                job = write_queue.get()
+                if job is None:
+                    return
+                try:
+                    self._export_csv(*job)
+                except OSError as e:
+                    print(f"ERROR: Failed to write {job[0]}: {str(e)}")
+        
+        def _search(part):
+            items, stats = self._process_part(vehicle_info, part)
+            if items:
+                # Names like 'A/C Compressor' can't go into a filename as-is
+                safe_name = part['search_query'].replace('/', '-')
+                write_queue.put((f"ebay_data_{safe_name}_{vin[-6:]}.csv", items))
+            return stats
+        
+        writer_thread = threading.Thread(target=_writer, daemon=True)
+        writer_thread.start()
+        # One session, one token; _ebay_sem still caps in-flight Browse calls
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(_search, self.parts_list))
+        finally:
+            write_queue.put(None)
+            writer_thread.join()
+        
+        print(f"\n{'Part':<30} {'Items':<6} {'Min':<10} {'Median':<10} {'Max':<10}")
+        print("-" * 70)
+        for part, stats in zip(self.parts_list, results):
+            if not stats:
+                print(f"{part['search_query'][:29]:<30} {0:<6} {'-':<10} {'-':<10} {'-':<10}")
+                continue
+            print(f"{part['search_query'][:29]:<30} {stats['count']:<6} ${stats['min']:<9.2f} ${stats['median']:<9.2f} ${stats['max']:<9.2f}")
+        
+        print(f"\nPer-part data exported to ebay_data_<part>_{vin[-6:]}.csv")
 
 def main():
     runner = EbayTestRunner()
@@ -267,6 +488,7 @@ def main():
     print("Usage examples:")
     print("runner.run_test('1HGBH41JXMN109186', 'engine')")
     print("runner.run_test('WBAPH7C51BE5M2396', 'headlight')")
+    print("runner.run_test_all('1HGBH41JXMN109186')")
     print()
     
     # Interactive mode
@@ -276,8 +498,11 @@ def main():
             if vin.lower() == 'quit':
                 break
             
-            part = input("Enter part name: ").strip()
-            if part:
+            part = input("Enter part name (or 'all'): ").strip()
+            if part.lower() == 'all':
+                runner.run_test_all(vin)
+                print("\n" + "="*60 + "\n")
+            elif part:
                 runner.run_test(vin, part)
                 print("\n" + "="*60 + "\n")
         except KeyboardInterrupt:
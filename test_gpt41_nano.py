@@ -1,12 +1,46 @@
 #!/usr/bin/env python3
 
+import json
 import os
 from dotenv import load_dotenv
 from openai import OpenAI
 
+# Strict JSON schema for the pricing reply, so output_text is plain JSON with no prose to strip
+_PRICING_FORMAT = {
+    'type': 'json_schema',
+    'name': 'pricing',
+    'strict': True,
+    'schema': {
+        'type': 'object',
+        'properties': {
+            'low_price': {'type': 'number'},
+            'average_price': {'type': 'number'},
+            'high_price': {'type': 'number'},
+            'items_analyzed': {'type': 'integer'},
+            'items_filtered_out': {'type': 'integer'},
+            'reasoning': {'type': 'string'},
+            'confidence_rating': {'type': 'string',
+                                  'enum': ['dark_green', 'light_green', 'yellow', 'orange', 'red']},
+            'confidence_explanation': {'type': 'string'}
+        },
+        'required': ['low_price', 'average_price', 'high_price', 'items_analyzed',
+                     'items_filtered_out', 'reasoning', 'confidence_rating', 'confidence_explanation'],
+        'additionalProperties': False
+    }
+}
+
 # Load environment variables
 load_dotenv()
 
+# One client per process so every call reuses the same connection pool
+_client = None
+
+def _get_client():
+    global _client
+    if _client is None:
+        _client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    return _client
+
 def test_gpt41_nano():
     """Test gpt-4.1-nano integration"""
     
@@ -17,7 +51,7 @@ def test_gpt41_nano():
         return False
     
     try:
-        client = OpenAI(api_key=openai_api_key)
+        client = _get_client()
         print("SUCCESS: OpenAI client initialized successfully")
     except Exception as e:
         print(f"ERROR: Failed to initialize OpenAI client: {e}")
@@ -58,7 +92,7 @@ def test_gpt41_nano():
 def test_pricing_analysis():
     """Test with sample pricing data"""
     
-    client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    client = _get_client()
     
     test_prompt = """Analyze these sample prices for A/C Compressor: $50.00, $60.00, $70.00, $80.00, $90.00
 
@@ -81,25 +115,16 @@ IMPORTANT: Your low_price cannot be lower than $50.00 (the minimum price in the
         
         response = client.responses.create(
             model="gpt-4.1-nano-2025-04-14",
-            input=test_prompt
+            input=test_prompt,
+            text={'format': _PRICING_FORMAT}
         )
         
         print("Pricing analysis API call successful")
         print(f"Response: {response.output_text[:200]}...")
         
         # Try to parse as JSON
-        import json
         try:
-            # Clean up response
-            response_text = response.output_text.strip()
-            if '{' in response_text:
-                json_start = response_text.find('{')
-                response_text = response_text[json_start:]
-            if '}' in response_text:
-                json_end = response_text.rfind('}') + 1
-                response_text = response_text[:json_end]
-            
-            result = json.loads(response_text)
+            result = json.loads(response.output_text)
             print("JSON parsing successful")
             
             low_price = result.get('low_price', 0)
@@ -1,9 +1,8 @@
 #!/usr/bin/env python3
 
-import os
+import json
 import sys
 from dotenv import load_dotenv
-from openai import OpenAI
 
 # Load environment variables
 load_dotenv()
@@ -11,10 +10,13 @@ load_dotenv()
 # Add main directory to path to import from main.py
 sys.path.append('.')
 
+# Same lazily built client and pricing schema as the gpt-4.1-nano checks
+from test_gpt41_nano import _PRICING_FORMAT, _get_client
+
 def test_pricing_calculation():
     """Test the fixed pricing calculation with realistic data"""
     
-    client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    client = _get_client()
     
     # Simulate realistic A/C Compressor data with some items to filter out
     test_csv_data = """Price,Shipping,Total,Title
@@ -106,25 +108,15 @@ Do NOT just return the minimum price (45.00) as your low_price. Calculate the ac
         
         response = client.responses.create(
             model="gpt-4.1-nano-2025-04-14",
-            input=prompt
+            input=prompt,
+            text={'format': _PRICING_FORMAT}
         )
         
         print("API call successful!")
         print(f"Response: {response.output_text}")
         
         # Parse and validate response
-        import json
-        response_text = response.output_text.strip()
-        
-        # Clean up response
-        if '{' in response_text:
-            json_start = response_text.find('{')
-            response_text = response_text[json_start:]
-        if '}' in response_text:
-            json_end = response_text.rfind('}') + 1
-            response_text = response_text[:json_end]
-        
-        result = json.loads(response_text)
+        result = json.loads(response.output_text)
         
         print("\n=== ANALYSIS RESULTS ===")
         print(f"Items analyzed: {result['items_analyzed']}")